@@ -82,6 +82,7 @@ def main():
                 config["ai_mode"],
                 config["ai_heuristic"],
                 benchmark=True,
+                workers=config["ai_workers"],
             )
             white_player = AIPlayer(
                 board,
@@ -89,6 +90,7 @@ def main():
                 config["white_ai_mode"],
                 config["white_ai_heuristic"],
                 benchmark=True,
+                workers=config["ai_workers"],
             )
         elif config["ai_color"] == "A":  # Both players with same config
             black_player = AIPlayer(
@@ -97,6 +99,7 @@ def main():
                 config["ai_mode"],
                 config["ai_heuristic"],
                 benchmark=True,
+                workers=config["ai_workers"],
             )
             white_player = AIPlayer(
                 board,
@@ -104,6 +107,7 @@ def main():
                 config["ai_mode"],
                 config["ai_heuristic"],
                 benchmark=True,
+                workers=config["ai_workers"],
             )
         elif config["ai_color"] == "X":  # AI as black, random as white
             black_player = AIPlayer(
@@ -112,6 +116,7 @@ def main():
                 config["ai_mode"],
                 config["ai_heuristic"],
                 benchmark=True,
+                workers=config["ai_workers"],
             )
             white_player = RandomPlayer()
         elif config["ai_color"] == "O":  # AI as white, random as black
@@ -122,6 +127,7 @@ def main():
                 config["ai_mode"],
                 config["ai_heuristic"],
                 benchmark=True,
+                workers=config["ai_workers"],
             )
     else:
         black_player = (
@@ -131,6 +137,7 @@ def main():
                 config["ai_mode"],
                 config["ai_heuristic"],
                 benchmark=True,
+                workers=config["ai_workers"],
             )
             if mode == parser.GameMode.AI.value and config["ai_color"] == "X"
             else HumanPlayer()
@@ -142,6 +149,7 @@ def main():
                 config["ai_mode"],
                 config["ai_heuristic"],
                 benchmark=True,
+                workers=config["ai_workers"],
             )
             if mode == parser.GameMode.AI.value and config["ai_color"] == "O"
             else HumanPlayer()
@@ -149,8 +157,8 @@ def main():
 
     # [Rest of the main function remains the same...]
 
-    logger.debug(f"   Black player is of class {black_player.__class__}.")
-    logger.debug(f"   White player is of class {white_player.__class__}.")
+    logger.debug("   Black player is of class %s.", black_player.__class__)
+    logger.debug("   White player is of class %s.", white_player.__class__)
 
     # then we setup the game controller depenging of the gamemode given
     controller = (
@@ -1,14 +1,145 @@
 """implementation of AI algorithms used for AIPlayer"""
 
+from array import array
+import atexit
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import multiprocessing
 import random
+import threading
+import time
 from copy import deepcopy
 import logging
 
+from othello.bitboard import BitboardProperties
 from othello.othello_board import OthelloBoard, Color
 
 logger = logging.getLogger("Othello")
 
+# transposition table entry flags: the stored value is exact, a lower bound (the
+# search failed high) or an upper bound (the search failed low)
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+TT_BITS = 20
+# a single search from find_best_move does not need as large a table
+SEARCH_TT_BITS = 16
+# below this depth starting the worker processes costs more than the search
+PARALLEL_MIN_DEPTH = 3
+# bounds of the values kept in the transposition table, the heuristics return
+# integer scores well within them
+TT_VALUE_MIN = -(1 << 15)
+TT_VALUE_MAX = (1 << 15) - 1
+# layout of a packed transposition table entry, from the lowest bit: used (1), depth
+# (8), flag (2), has move (1), move x (4), move y (4), value (16), generation (28)
+_TT_USED = 1
+_TT_HAS_MOVE = 1 << 11
+_TT_GENERATION_MASK = (1 << 28) - 1
+
+
+class TranspositionTable:
+    """
+    Fixed size transposition table for alphabeta, meant to be kept from one search to
+    the next.
+
+    It holds `1 << tt_bits` buckets of two slots, indexed by the low bits of
+    `board.position_hash()`. The first slot keeps the deepest search, or anything over
+    an entry of a previous search, the second one always takes what the first refused.
+
+    Slots are stored in two arrays of 64 bits integers rather than as tuples: one for
+    the keys and one for the entries, packed by `store` and unpacked by `get` into
+    `(depth, flag, value, best_move, generation)` tuples. Values are clamped to
+    `TT_VALUE_MIN`, `TT_VALUE_MAX`.
+    """
+
+    def __init__(self, tt_bits: int = TT_BITS):
+        """
+        :param tt_bits: log2 of the number of buckets
+        :type tt_bits: int
+        """
+        self.mask = (1 << tt_bits) - 1
+        self.generation = 0
+        self.keys = array("Q", bytes(8 << (tt_bits + 1)))
+        # an empty slot is 0, stored entries always have `_TT_USED` set
+        self.entries = array("Q", bytes(8 << (tt_bits + 1)))
+
+    def __len__(self) -> int:
+        return sum(entry != 0 for entry in self.entries)
+
+    def get(self, key: int) -> tuple | None:
+        """
+        :param key: The position hash
+        :return: The stored `(depth, flag, value, best_move, generation)` entry, None
+            if there is none
+        """
+        index = (key & self.mask) << 1
+        if self.keys[index] == key and (entry := self.entries[index]):
+            return self._unpack(entry)
+        index += 1
+        if self.keys[index] == key and (entry := self.entries[index]):
+            return self._unpack(entry)
+        return None
+
+    @staticmethod
+    def _unpack(entry: int) -> tuple:
+        """
+        Unpacks an entry packed by `store`.
+        """
+        best_move = None
+        if entry & _TT_HAS_MOVE:
+            best_move = ((entry >> 12) & 0xF, (entry >> 16) & 0xF)
+        return (
+            (entry >> 1) & 0xFF,
+            (entry >> 9) & 0x3,
+            ((entry >> 20) & 0xFFFF) + TT_VALUE_MIN,
+            best_move,
+            entry >> 36,
+        )
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        flag: int,
+        value: float,
+        best_move: tuple[int, int] | None,
+    ):
+        """
+        Stores the result of a search in the bucket of `key`.
+
+        :param key: The position hash
+        :param depth: The remaining depth the position was searched at
+        :param flag: One of `TT_EXACT`, `TT_LOWER` or `TT_UPPER`
+        :param value: The value found by the search
+        :param best_move: The best move found, None for leaves
+        """
+        index = (key & self.mask) << 1
+        first = self.entries[index]
+        if (
+            first
+            and (first >> 1) & 0xFF > depth
+            and first >> 36 == self.generation & _TT_GENERATION_MASK
+        ):
+            index += 1
+        entry = (
+            _TT_USED
+            | depth << 1
+            | flag << 9
+            | (int(min(max(value, TT_VALUE_MIN), TT_VALUE_MAX)) - TT_VALUE_MIN) << 20
+            | (self.generation & _TT_GENERATION_MASK) << 36
+        )
+        if best_move is not None:
+            entry |= _TT_HAS_MOVE | best_move[0] << 12 | best_move[1] << 16
+        self.keys[index] = key
+        self.entries[index] = entry
+
+    def new_search(self):
+        """
+        Starts a new generation, to be called before each search from the root.
+        """
+        self.generation += 1
+
 
 def get_player_at(board: OthelloBoard, x_coord: int, y_coord: int) -> Color:
     """Helper function to determine which player occupies a given board position."""
@@ -19,6 +150,57 @@ def get_player_at(board: OthelloBoard, x_coord: int, y_coord: int) -> Color:
     return Color.EMPTY
 
 
+@lru_cache(maxsize=None)
+def move_ordering_masks(size: int) -> tuple[int, int, int, int]:
+    """
+    Splits the squares of a board in the order alphabeta should try them: corners,
+    then the other edge squares, then the interior, then the X-squares (diagonally
+    next to a corner) last since playing them usually gives the corner away.
+
+    :param size: The size of the board
+    :type size: int
+    :return: The corners, edges, interior and X-squares masks
+    :rtype: tuple[int, int, int, int]
+    """
+    last = size - 1
+    corners = edges = x_squares = 0
+    for y_coord in range(size):
+        for x_coord in range(size):
+            bit = 1 << (y_coord * size + x_coord)
+            on_x_edge = x_coord in (0, last)
+            on_y_edge = y_coord in (0, last)
+            if on_x_edge and on_y_edge:
+                corners |= bit
+            elif on_x_edge or on_y_edge:
+                edges |= bit
+            elif x_coord in (1, last - 1) and y_coord in (1, last - 1):
+                x_squares |= bit
+    interior = ((1 << (size * size)) - 1) & ~(corners | edges | x_squares)
+    return corners, edges, interior, x_squares
+
+
+def ordered_moves(moves: int, size: int) -> list[tuple[int, int]]:
+    """
+    Returns the coordinates of the hot bits of `moves` following `move_ordering_masks`.
+
+    :param moves: The raw bits of the legal moves
+    :type moves: int
+    :param size: The size of the board
+    :type size: int
+    :return: The list of move coordinates, best candidates first
+    :rtype: list[tuple[int, int]]
+    """
+    square_coordinates = BitboardProperties.get(size).coordinates
+    coordinates = []
+    for bucket in move_ordering_masks(size):
+        bits = moves & bucket
+        while bits:
+            lowest = bits & -bits
+            coordinates.append(square_coordinates[lowest.bit_length() - 1])
+            bits ^= lowest
+    return coordinates
+
+
 def minimax(
     board: OthelloBoard, depth: int, max_player: Color, heuristic: Callable
 ) -> float:
@@ -38,11 +220,15 @@ def minimax(
     :param heuristic: The heuristic used
     :return: The heuristic value of the best move found from the current board state.
     """
-    logger.debug(
-        "Starting minimax evaluation with depth: %d, player: %s.",
-        depth,
-        max_player.name,
-    )
+    # checked once per node rather than by each logging call, whose arguments
+    # are built even when the level is disabled
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug(
+            "Starting minimax evaluation with depth: %d, player: %s.",
+            depth,
+            max_player.name,
+        )
 
     if not depth or board.is_game_over():
         return heuristic(board, max_player)
@@ -52,27 +238,31 @@ def minimax(
     ):
         return minimax(board, depth - 1, max_player, heuristic)
 
-    logger.debug("   Valid moves at depth %d: %s.", depth, valid_moves)
+    if debug:
+        logger.debug("   Valid moves at depth %d: %s.", depth, valid_moves)
+    # bound once, they are called for every child
+    board_play, board_pop = board.play, board.pop
     if max_player == board.current_player:
         evaluation = float("-inf")
         for move_x, move_y in valid_moves:
-            board.play(move_x, move_y)
+            board_play(move_x, move_y)
             evaluation_score = minimax(board, depth - 1, max_player, heuristic)
             evaluation = max(evaluation, evaluation_score)
-            board.pop()
+            board_pop()
     else:
         evaluation = float("inf")
         for move_x, move_y in valid_moves:
-            board.play(move_x, move_y)
+            board_play(move_x, move_y)
             evaluation_score = minimax(board, depth - 1, max_player, heuristic)
             evaluation = min(evaluation, evaluation_score)
-            board.pop()
-
-    logger.debug(
-        "   Minimax evaluationuation at depth %d returning score: %d.",
-        depth,
-        evaluation,
-    )
+            board_pop()
+
+    if debug:
+        logger.debug(
+            "   Minimax evaluationuation at depth %d returning score: %d.",
+            depth,
+            evaluation,
+        )
     return evaluation
 
 
@@ -83,6 +273,7 @@ def alphabeta(
     beta: int,
     max_player: Color,
     heuristic: Callable,
+    transposition_table: TranspositionTable | None = None,
 ) -> float:
     """
     Evaluate the best move for the current player using the Alpha-Beta Pruning algorithm.
@@ -105,67 +296,134 @@ def alphabeta(
     :param max_player: The color of the player to maximize the score for.
     :type max_player: Color
     :param heuristic: The heuristic used
+    :param transposition_table: Entries are reused when they were searched at least as
+        deep. Only share one between searches with the same `max_player` and
+        `heuristic`.
+    :type transposition_table: TranspositionTable | None
     :return: The heuristic value of the best move found from the current board state.
     :rtype: int
     """
-    logger.debug(
-        "Starting alphabeta evaluation with depth: %d, player: %s, alpha: %f, beta: %f.",
-        depth,
-        max_player.name,
-        alpha,
-        beta,
-    )
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug(
+            "Starting alphabeta evaluation with depth: %d, player: %s, alpha: %f, "
+            "beta: %f.",
+            depth,
+            max_player.name,
+            alpha,
+            beta,
+        )
+
+    key = hash_move = None
+    if transposition_table is not None:
+        key = board.position_hash()
+        if (entry := transposition_table.get(key)) is not None:
+            hash_move = entry[3]
+            if entry[0] >= depth:
+                flag, value = entry[1], entry[2]
+                if flag == TT_EXACT:
+                    return value
+                if flag == TT_LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return value
+    alpha_orig, beta_orig = alpha, beta
 
     if not depth or board.is_game_over():
-        return heuristic(board, max_player)
+        evaluation = heuristic(board, max_player)
+        if key is not None:
+            transposition_table.store(key, depth, TT_EXACT, evaluation, None)
+        return evaluation
 
     if not (
-        valid_moves := board.line_cap_move(board.current_player).hot_bits_coordinates()
+        valid_moves := ordered_moves(
+            board.line_cap_move(board.current_player).bits, board.size.value
+        )
     ):
         return minimax(board, depth - 1, max_player, heuristic)
-
-    logger.debug("   Valid moves at depth %d: %s.", depth, valid_moves)
+    # the best move of an earlier, shallower visit is the most likely cutoff
+    if hash_move is not None and hash_move in valid_moves:
+        valid_moves.remove(hash_move)
+        valid_moves.insert(0, hash_move)
+
+    if debug:
+        logger.debug("   Valid moves at depth %d: %s.", depth, valid_moves)
+    # bound once, they are called for every child
+    board_play, board_pop = board.play, board.pop
+    best_move = None
     if max_player == board.current_player:
         evaluation = float("-inf")
         for move_x, move_y in valid_moves:
-            board.play(move_x, move_y)
+            board_play(move_x, move_y)
             evaluation_score = alphabeta(
-                board, depth - 1, alpha, beta, max_player, heuristic
+                board,
+                depth - 1,
+                alpha,
+                beta,
+                max_player,
+                heuristic,
+                transposition_table,
             )
+            if evaluation_score > evaluation:
+                best_move = (move_x, move_y)
             evaluation = max(evaluation, evaluation_score)
-            board.pop()
+            board_pop()
             alpha = int(max(alpha, evaluation))
             if beta <= alpha:
-                logger.debug(
-                    "   Alpha-Beta pruning occurred at depth %d (alpha: %f, beta: %f).",
-                    depth,
-                    alpha,
-                    beta,
-                )
+                if debug:
+                    logger.debug(
+                        "   Alpha-Beta pruning occurred at depth %d (alpha: %f, beta: "
+                        "%f).",
+                        depth,
+                        alpha,
+                        beta,
+                    )
                 break
     else:
         evaluation = float("inf")
         for move_x, move_y in valid_moves:
-            board.play(move_x, move_y)
+            board_play(move_x, move_y)
             evaluation_score = alphabeta(
-                board, depth - 1, alpha, beta, max_player, heuristic
+                board,
+                depth - 1,
+                alpha,
+                beta,
+                max_player,
+                heuristic,
+                transposition_table,
             )
+            if evaluation_score < evaluation:
+                best_move = (move_x, move_y)
             evaluation = min(evaluation, evaluation_score)
-            board.pop()
+            board_pop()
             if (beta := int(min(beta, evaluation))) <= alpha:
-                logger.debug(
-                    "   Alpha-Beta pruning occurred at depth %d (alpha: %f, beta: %f).",
-                    depth,
-                    alpha,
-                    beta,
-                )
+                if debug:
+                    logger.debug(
+                        "   Alpha-Beta pruning occurred at depth %d (alpha: %f, beta: "
+                        "%f).",
+                        depth,
+                        alpha,
+                        beta,
+                    )
                 break
 
-    logger.debug(
-        "   Alphabeta evaluationuation at depth %d returning score: %d.",
-        depth,
-        evaluation,
-    )
+    if key is not None:
+        if evaluation <= alpha_orig:
+            flag = TT_UPPER
+        elif evaluation >= beta_orig:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        transposition_table.store(key, depth, flag, evaluation, best_move)
+
+    if debug:
+        logger.debug(
+            "   Alphabeta evaluationuation at depth %d returning score: %d.",
+            depth,
+            evaluation,
+        )
     return evaluation
 
 
@@ -173,9 +431,13 @@ def find_best_move(
     board: OthelloBoard,
     depth: int = 3,
     max_player: Color = Color.BLACK,
-    search_algo: str = "minimax",
-    heuristic: str = "corners_captured",
+    search_algo: str = "alphabeta",
+    heuristic: str | Callable = "corners_captured",
     benchmark: bool = False,
+    transposition_table: TranspositionTable | None = None,
+    pv_hint: tuple[int, int] | None = None,
+    workers: int = 1,
+    root_moves: list[tuple[int, int]] | None = None,
 ) -> tuple[int, int]:
     """
     Determine the best move for the current player on the Othello board.
@@ -196,8 +458,22 @@ def find_best_move(
     :type maximizing: bool
     :param search_algo: The search algorithm to use, either "minimax" or "alphabeta".
     :type search_algo: str
-    :param heuristic: The heuristic function to evaluate board states.
-    :type heuristic: str
+    :param heuristic: The heuristic function to evaluate board states, or its name.
+    :type heuristic: str | Callable
+    :param transposition_table: The transposition table used by alphabeta, pass the
+        same one across calls to reuse its entries, a fresh one is used otherwise.
+    :type transposition_table: TranspositionTable | None
+    :param pv_hint: A move searched first at the root if it is legal, typically the
+        best move of a shallower search. Otherwise the best move stored for the root in
+        `transposition_table`, if any, is searched first.
+    :type pv_hint: tuple[int, int] | None
+    :param workers: The number of processes alphabeta may search the root moves with,
+        the first root move is always searched here to bound the others.
+    :type workers: int
+    :param root_moves: The legal moves of `board` as given by `ordered_moves`, to
+        share them between the searches of an iterative deepening. They are not
+        modified. Computed from `board` when None.
+    :type root_moves: list[tuple[int, int]] | None
     :return: The coordinates of the best move for the current player.
     :rtype: tuple[int, int]
     """
@@ -207,43 +483,104 @@ def find_best_move(
         depth,
         max_player.name,
     )
+    start_time = time.time()
 
     if depth == 0 or board.is_game_over():
         return (-1, -1)
 
-    if heuristic == "coin_parity":
-        heuristic_function = coin_parity_heuristic
-    elif heuristic == "corners_captured":
-        heuristic_function = corners_captured_heuristic
-    elif heuristic == "mobility":
-        heuristic_function = mobility_heuristic
-    else:
-        heuristic_function = all_in_one_heuristic
+    heuristic_function = resolve_heuristic(heuristic)
+    # the algorithm name is compared once here rather than for every root move
+    use_minimax = search_algo == "minimax"
 
-    valid_moves = board.line_cap_move(board.current_player).hot_bits_coordinates()
+    if root_moves is None:
+        valid_moves = ordered_moves(
+            board.line_cap_move(board.current_player).bits, board.size.value
+        )
+    else:
+        valid_moves = list(root_moves)
+    if (
+        pv_hint not in valid_moves
+        and transposition_table is not None
+        and (entry := transposition_table.get(board.position_hash())) is not None
+    ):
+        # the root was searched as an inner node before, typically by the previous
+        # turn's search, whose best move there is the best guess available
+        pv_hint = entry[3]
+    if pv_hint in valid_moves:
+        # a good first move makes alphabeta prune most of the other root moves
+        valid_moves.remove(pv_hint)
+        valid_moves.insert(0, pv_hint)
     logger.debug("   Evaluating %d possible moves: %s.", len(valid_moves), valid_moves)
+    if len(valid_moves) == 1:
+        # forced move, no need to search it
+        if benchmark:
+            print(f"Time taken: {time.time() - start_time} seconds")
+        return valid_moves[0]
 
     best_move = (-1, -1)
-    best_score = float("-inf") if max_player == board.current_player else float("inf")
-    for move_x, move_y in valid_moves:
-        new_board = deepcopy(board)
-
-        new_board.play(move_x, move_y)
-        if search_algo == "minimax":
-            score = minimax(new_board, depth - 1, max_player, heuristic_function)
+    maximizing = max_player == board.current_player
+    best_score = float("-inf") if maximizing else float("inf")
+    # the root window is shared by all root moves so that later siblings get pruned
+    # against the best score found so far
+    alpha, beta = float("-inf"), float("inf")
+    if transposition_table is None:
+        transposition_table = TranspositionTable(SEARCH_TT_BITS)
+    parallel = (
+        workers > 1
+        and not use_minimax
+        and maximizing
+        and depth >= PARALLEL_MIN_DEPTH
+        and len(valid_moves) > 1
+    )
+    # a single copy is searched with play/pop, as the caller's board may be the game's
+    # one, read by the UI while a background search runs
+    search_board = deepcopy(board)
+    for move_x, move_y in valid_moves[:1] if parallel else valid_moves:
+        search_board.play(move_x, move_y)
+        if use_minimax:
+            score = minimax(search_board, depth - 1, max_player, heuristic_function)
         else:
             score = alphabeta(
-                new_board,
+                search_board,
                 depth - 1,
-                float("-inf"),
-                float("inf"),
+                alpha,
+                beta,
                 max_player,
                 heuristic_function,
+                transposition_table,
             )
+        search_board.pop()
         logger.debug("   Move (%d, %d) evaluated with score: %f", move_x, move_y, score)
         if score > best_score:
             best_score = score
             best_move = (move_x, move_y)
+            if maximizing:
+                alpha = best_score
+
+    if parallel:
+        # young brothers wait: the eldest root move was searched above, its score
+        # bounds its younger brothers which are searched in parallel
+        pool = root_search_pool(workers)
+        futures = [
+            pool.submit(
+                evaluate_root_move,
+                # back at the root after the pop above, and not touched again until
+                # the results are in, unlike the caller's board
+                search_board,
+                move,
+                depth - 1,
+                alpha,
+                max_player,
+                heuristic_function,
+            )
+            for move in valid_moves[1:]
+        ]
+        for move, future in zip(valid_moves[1:], futures):
+            score = future.result()
+            logger.debug("   Move %s evaluated with score: %f", move, score)
+            if score > best_score:
+                best_score = score
+                best_move = move
 
     if benchmark:
         end_time = time.time()
@@ -252,6 +589,103 @@ def find_best_move(
     return best_move
 
 
+class _RootSearchPool:
+    """
+    Holds the process pool of `root_search_pool`, its number of workers and the lock
+    guarding both, the pool being None until first needed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.workers = 0
+        self.pool: ProcessPoolExecutor | None = None
+
+    def get(self, workers: int) -> ProcessPoolExecutor:
+        """
+        :param workers: The number of worker processes
+        :return: The pool, replacing the current one if it has another number of
+            workers
+        """
+        with self.lock:
+            if self.pool is not None and self.workers == workers:
+                return self.pool
+            if self.pool is not None:
+                self.pool.shutdown()
+            self.pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            self.workers = workers
+            return self.pool
+
+    def shutdown(self):
+        """
+        Shuts the pool down, if it was ever started.
+        """
+        with self.lock:
+            if self.pool is not None:
+                self.pool.shutdown()
+                self.pool = None
+
+
+_ROOT_SEARCH_POOL = _RootSearchPool()
+
+
+def root_search_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Returns the process pool used by `find_best_move`, kept alive from one search to
+    the next. Workers are spawned rather than forked as the GUI searches from a thread.
+    Asking for another number of workers shuts the previous pool down.
+
+    :param workers: The number of worker processes
+    :type workers: int
+    :return: The process pool
+    :rtype: ProcessPoolExecutor
+    """
+    return _ROOT_SEARCH_POOL.get(workers)
+
+
+@atexit.register
+def shutdown_root_search_pool():
+    """
+    Shuts the pool of `root_search_pool` down, if it was ever started. Registered to
+    run at exit.
+    """
+    _ROOT_SEARCH_POOL.shutdown()
+
+
+def evaluate_root_move(
+    board: OthelloBoard,
+    move: tuple[int, int],
+    depth: int,
+    alpha: float,
+    max_player: Color,
+    heuristic: Callable,
+) -> float:
+    """
+    Searches a single root move with alphabeta, run in a worker process by
+    `find_best_move`. Workers do not share the transposition table of the caller.
+
+    :param board: The position before the move
+    :param move: The root move to evaluate
+    :param depth: The remaining depth after the move
+    :param alpha: The score of the best root move found so far
+    :param max_player: The color of the player to maximize the score for
+    :param heuristic: The heuristic used
+    :return: The score of the move, at most `alpha` if it is not better
+    :rtype: float
+    """
+    board.play(move[0], move[1])
+    return alphabeta(
+        board,
+        depth,
+        alpha,
+        float("inf"),
+        max_player,
+        heuristic,
+        TranspositionTable(SEARCH_TT_BITS),
+    )
+
+
 def random_move(board: OthelloBoard) -> tuple[int, int]:
     """
     Select a random valid move for the current player on the Othello board.
@@ -288,18 +722,14 @@ def corners_captured_heuristic(board: OthelloBoard, max_player: Color) -> int:
     :return: An integer score representing the corner occupation advantage.
     :rtype: int
     """
-    logger.debug("Calculating %s heuristic for %s", "corners_captured", max_player.name)
-    corners = [
-        (0, 0),
-        (board.size.value - 1, 0),
-        (0, board.size.value - 1),
-        (board.size.value - 1, board.size.value - 1),
-    ]
-
-    max_corners = sum(1 for x, y in corners if get_player_at(board, x, y) == max_player)
-    min_corners = sum(
-        1 for x, y in corners if get_player_at(board, x, y) == ~max_player
-    )
+    logger.debug("Calculating %s heuristic for %s", "corners_captured", max_player)
+    corners = move_ordering_masks(board.size.value)[0]
+    own, opponent = board.black.bits, board.white.bits
+    if max_player is Color.WHITE:
+        own, opponent = opponent, own
+
+    max_corners = (own & corners).bit_count()
+    min_corners = (opponent & corners).bit_count()
 
     if max_corners + min_corners:
         return int(100 * (max_corners - min_corners) / (max_corners + min_corners))
@@ -324,14 +754,14 @@ def coin_parity_heuristic(board: OthelloBoard, max_player: Color) -> int:
     :return: An integer score representing the coin parity advantage.
     :rtype: int
     """
-    logger.debug("Calculating %s heuristic for %s", "coin_parity", max_player.name)
+    logger.debug("Calculating %s heuristic for %s", "coin_parity", max_player)
 
-    black_count = board.black.popcount()
-    white_count = board.white.popcount()
+    black_count = board.black.bits.bit_count()
+    white_count = board.white.bits.bit_count()
 
-    if max_player == Color.BLACK:
+    if max_player is Color.BLACK:
         return int(100 * (black_count - white_count) / (black_count + white_count))
-    if max_player == Color.WHITE:
+    if max_player is Color.WHITE:
         return int(100 * (white_count - black_count) / (white_count + black_count))
     return Color.EMPTY
 
@@ -354,19 +784,20 @@ def mobility_heuristic(board: OthelloBoard, max_player: Color) -> int:
     :return: An integer score representing the mobility advantage.
     :rtype: int
     """
-    logger.debug("Calculating %s heuristic for %s", "mobility", max_player.name)
+    logger.debug("Calculating %s heuristic for %s", "mobility", max_player)
 
-    black_move_count = board.line_cap_move(board.black).popcount()
-    white_move_count = board.line_cap_move(board.white).popcount()
+    black, white = board.black.bits, board.white.bits
+    black_move_count = board.shift_along(white, black).bit_count()
+    white_move_count = board.shift_along(black, white).bit_count()
 
     if black_move_count + white_move_count:
-        if max_player == Color.BLACK:
+        if max_player is Color.BLACK:
             return int(
                 100
                 * (black_move_count - white_move_count)
                 / (black_move_count + white_move_count)
             )
-        if max_player == Color.WHITE:
+        if max_player is Color.WHITE:
             return int(
                 100
                 * (white_move_count - black_move_count)
@@ -380,7 +811,7 @@ def all_in_one_heuristic(board: OthelloBoard, max_player: Color) -> int:
     """
     Performs all the heuristics at once
     """
-    logger.debug("Calculating %s heuristic for %s", "all_in_one", max_player.name)
+    logger.debug("Calculating %s heuristic for %s", "all_in_one", max_player)
     w_corners = 10
     w_mobility = 4
     w_coins = 1
@@ -390,3 +821,26 @@ def all_in_one_heuristic(board: OthelloBoard, max_player: Color) -> int:
         + w_mobility * mobility_heuristic(board, max_player)
         + w_coins * coin_parity_heuristic(board, max_player)
     )
+
+
+HEURISTICS: dict[str, Callable] = {
+    "coin_parity": coin_parity_heuristic,
+    "corners_captured": corners_captured_heuristic,
+    "mobility": mobility_heuristic,
+    "all_in_one": all_in_one_heuristic,
+}
+
+
+def resolve_heuristic(heuristic: str | Callable) -> Callable:
+    """
+    Returns the heuristic function named `heuristic`, unknown names fall back to
+    `all_in_one_heuristic`. Functions are returned as is.
+
+    :param heuristic: The name of a heuristic, or a heuristic function
+    :type heuristic: str | Callable
+    :return: The heuristic function
+    :rtype: Callable
+    """
+    if callable(heuristic):
+        return heuristic
+    return HEURISTICS.get(heuristic, all_in_one_heuristic)
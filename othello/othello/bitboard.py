@@ -9,6 +9,7 @@ from enum import Enum, auto
 from copy import copy
 
 import logging
+import random
 
 
 logger = logging.getLogger("Othello")
@@ -39,6 +40,8 @@ class BitboardProperties:
         self.mask: int
         self.west_mask: int
         self.east_mask: int
+        self.bit_masks: tuple[int, ...]
+        self.coordinates: tuple[tuple[int, int], ...]
 
     @classmethod
     def get(cls, size: int):
@@ -53,6 +56,11 @@ class BitboardProperties:
                 structure.mask |= 1 << i
                 structure.west_mask |= (1 << i) if i % size else 0
                 structure.east_mask |= (1 << i) if i % size != size - 1 else 0
+            structure.bit_masks = tuple(1 << i for i in range(size * size))
+            # (x, y) of every bit index
+            structure.coordinates = tuple(
+                (i % size, i // size) for i in range(size * size)
+            )
             cls._instances[size] = structure
         return cls._instances[size]
 
@@ -62,6 +70,9 @@ class Bitboard:
     objects on a board
     """
 
+    # many bitboards are created per move, slots keep them small and quick to copy
+    __slots__ = ("size", "mask", "west_mask", "east_mask", "bit_masks", "bits")
+
     def __init__(self, size: int, bits=0):
         """
         Initializes a Bitboard with a given size and bits.
@@ -77,6 +88,7 @@ class Bitboard:
         self.mask = structure.mask
         self.west_mask = structure.west_mask
         self.east_mask = structure.east_mask
+        self.bit_masks = structure.bit_masks
         self.bits = bits & self.mask
 
     def __copy__(self):
@@ -85,6 +97,7 @@ class Bitboard:
         result.mask = self.mask
         result.west_mask = self.west_mask
         result.east_mask = self.east_mask
+        result.bit_masks = self.bit_masks
         result.bits = self.bits
         return result
 
@@ -103,13 +116,13 @@ class Bitboard:
         self.__check_bit_idx_is_legal(bit_idx)
         if value:
             # we simply need to set the corresponding bit to 1 using binary-or
-            self.bits |= 1 << bit_idx
+            self.bits |= self.bit_masks[bit_idx]
         else:
             # a little trickier, we need to generate a mask that has a 0 at the location
             # we want to set to 0, then use a binary with the mask effectively
             # keeping every set bit but the one we are trying to set to 0
             mask = self.mask
-            mask ^= 1 << bit_idx
+            mask ^= self.bit_masks[bit_idx]
             self.bits &= mask
 
     def get(self, x_coord: int, y_coord: int) -> bool:
@@ -124,9 +137,7 @@ class Bitboard:
         """
         bit_idx = self.__coords_to_bit_idx(x_coord, y_coord)
         self.__check_bit_idx_is_legal(bit_idx)
-        mask = 1 << bit_idx
-        rez = self.bits & mask
-        return rez
+        return self.bits & self.bit_masks[bit_idx]
 
     def shift(self, to_dir: Direction):
         """
@@ -156,36 +167,13 @@ class Bitboard:
 
     def popcount(self) -> int:
         """
-        popcount (SWAR) simple python port supporting arbitrary-sized bitboards.
+        Counts the hot bits with `int.bit_count`, which CPython runs as a single
+        popcount instruction per machine word, on bitboards of any size.
 
         :returns: The number of hot bits in the bitboard representation
         :rtype: int
         """
-        summed = 0
-        remaining_bits = self.bits
-        while remaining_bits > 0:
-            chunk_n = remaining_bits & 0xFFFFFFFFFFFFFFFF
-            chunk_n = (chunk_n & 0x5555555555555555) + (
-                (chunk_n >> 1) & 0x5555555555555555
-            )
-            chunk_n = (chunk_n & 0x3333333333333333) + (
-                (chunk_n >> 2) & 0x3333333333333333
-            )
-            chunk_n = (chunk_n & 0x0F0F0F0F0F0F0F0F) + (
-                (chunk_n >> 4) & 0x0F0F0F0F0F0F0F0F
-            )
-            chunk_n = (chunk_n & 0x00FF00FF00FF00FF) + (
-                (chunk_n >> 8) & 0x00FF00FF00FF00FF
-            )
-            chunk_n = (chunk_n & 0x0000FFFF0000FFFF) + (
-                (chunk_n >> 16) & 0x0000FFFF0000FFFF
-            )
-            chunk_n = (chunk_n & 0x00000000FFFFFFFF) + (
-                (chunk_n >> 32) & 0x00000000FFFFFFFF
-            )
-            summed += chunk_n
-            remaining_bits >>= 64
-        return summed
+        return self.bits.bit_count()
 
     def hot_bits_coordinates(self) -> list[tuple[int, int]]:
         """
@@ -193,15 +181,44 @@ class Bitboard:
         :returns: The list of coordinates set to 1 in the bitboard, in the form list[(x, y)...].
         :rtype: list[tuple[int, int]]
         """
+        coordinates = BitboardProperties.get(self.size).coordinates
         positions = []
         bits_copy = self.bits
-        while bits_copy > 0:
+        while bits_copy:
             last_hot_bit = bits_copy & -bits_copy
-            position_1d = (last_hot_bit).bit_length() - 1
-            positions.append((position_1d % self.size, position_1d // self.size))
-            bits_copy &= bits_copy - 1
+            positions.append(coordinates[last_hot_bit.bit_length() - 1])
+            bits_copy ^= last_hot_bit
         return positions
 
+    def random_hot_bit_index(self, rng=random) -> int:
+        """
+        Returns the index (y * size + x) of one hot bit picked uniformly, without
+        building the whole list of coordinates like `hot_bits_coordinates` does.
+
+        :param rng: Anything with a `randrange` method, the `random` module by default.
+        :returns: The index of the picked hot bit.
+        :rtype: int
+        :raises ValueError: if the bitboard is empty.
+        """
+        bits_copy = self.bits
+        # int.bit_count (3.10+, the cli already needs 3.10 for `match`) is a single
+        # builtin call where popcount loops over 64 bit chunks
+        for _ in range(rng.randrange(bits_copy.bit_count())):
+            bits_copy &= bits_copy - 1
+        return (bits_copy & -bits_copy).bit_length() - 1
+
+    def random_hot_bit(self, rng=random) -> tuple[int, int]:
+        """
+        Same as `random_hot_bit_index` but returns (x, y) coordinates.
+
+        :param rng: Anything with a `randrange` method, the `random` module by default.
+        :returns: The coordinates of the picked hot bit.
+        :rtype: tuple[int, int]
+        :raises ValueError: if the bitboard is empty.
+        """
+        position_1d = self.random_hot_bit_index(rng)
+        return (position_1d % self.size, position_1d // self.size)
+
     def empty(self) -> bool:
         """
         Check wether or not the bitboard is empty (popcount of 0).
@@ -209,7 +226,7 @@ class Bitboard:
         :returns: The truth value of the emptyness of the bitboard
         :rtype: bool
         """
-        return not self.popcount()
+        return not self.bits
 
     def __shift_w(self) -> Bitboard:
         """
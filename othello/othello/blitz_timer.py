@@ -10,6 +10,9 @@ from othello.othello_board import Color
 
 logger = logging.getLogger("Othello")
 
+# the timer keys of the players, indexed by `Color.index`
+PLAYER_KEYS = ("black", "white")
+
 
 class BlitzTimer:
     """
@@ -29,7 +32,7 @@ class BlitzTimer:
         )
         self.start_time = None
         self.total_time = time_limit * 60  # Convert minutes to seconds
-        self.remaining_time = {"black": self.total_time, "white": self.total_time}
+        self.remaining_time = dict.fromkeys(PLAYER_KEYS, self.total_time)
         self.current_player = None
         logger.debug(
             "   BlitzTimer initialized with %d seconds per player.", self.total_time
@@ -91,8 +94,10 @@ class BlitzTimer:
             float: Remaining time in seconds.
         """
         if self.start_time and player == self.current_player:
-            elapsed = time() - self.start_time
-            self.start_time = time()
+            # read the clock once so no time is lost between the two uses
+            now = time()
+            elapsed = now - self.start_time
+            self.start_time = now
             base_time = self.remaining_time[player]
             self.remaining_time[player] = max(0, base_time - elapsed)
             logger.debug(
@@ -133,9 +138,7 @@ class BlitzTimer:
             tuple: (minutes, seconds).
         """
         logger.debug("Converting time for player: %s.", player)
-        total_seconds = int(
-            self.get_remaining_time("black" if player is Color.BLACK else "white")
-        )
+        total_seconds = int(self.get_remaining_time(PLAYER_KEYS[player.index]))
         return divmod(total_seconds, 60)  # Returns (minutes, seconds)
 
     def display_time_player(self, player: Color) -> str:
@@ -30,11 +30,10 @@ class BoardParser:
     empty_char = " "
 
     def __init__(self, raw_save: str):
+        self.__buffer = raw_save.split("\n")
         logger.debug(
-            "Initializing BoardParser with %d lines of input.",
-            len(raw_save.split("\n")),
+            "Initializing BoardParser with %d lines of input.", len(self.__buffer)
         )
-        self.__buffer = raw_save.split("\n")
         self.__x = 0
         self.__y = 0
         self.__case_values = tuple(c.value for c in Color)
@@ -205,8 +204,7 @@ class BoardParser:
             try:
                 board.play(move[0], move[1])
             except IllegalMoveException as exc:
-                print(board)
-                log.log_error_message(exc, context="Black move is illegal.")
+                log.log_error_message(exc, context="White move is illegal.")
                 raise BoardParserException(
                     f"white move {white_play} is illegal ({exc})", self.__y
                 ) from exc
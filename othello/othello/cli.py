@@ -1,10 +1,16 @@
 """Game Modes for Othello"""
 
 import logging
+import re
 
-from othello.command_parser import CommandParser, CommandKind, CommandParserException
+from othello.command_parser import (
+    CommandParser,
+    CommandKind,
+    CommandParserException,
+    get_command_parser,
+)
 from othello.config import save_board_state_history
-from othello.othello_board import Color
+from othello.othello_board import SQUARE_NAMES, Color
 from othello.controllers import (
     GameController,
 )
@@ -12,6 +18,8 @@ from othello.controllers import (
 
 logger = logging.getLogger("Othello")
 
+MOVE_INPUT_REGEX = re.compile(r"([a-z])(\d+)")
+
 
 class OthelloCLI:
     """
@@ -44,10 +52,11 @@ class OthelloCLI:
         and corresponding symbol.
         """
         logger.debug("Entering display_board function from cli.py.")
-        print(str(self.controller))
+        current_player = self.controller.get_current_player()
+        # a single print, so that the board goes out in one write
         print(
-            f"\n{self.controller.get_current_player().name}'s turn "
-            f"({self.controller.get_current_player().value})"
+            f"{self.controller}\n\n{current_player.name}'s turn "
+            f"({current_player.value})"
         )
 
     def check_game_over(self, possible_moves):
@@ -78,13 +87,11 @@ class OthelloCLI:
 
         # If no moves for current player but game isn't over (other player can still move)
         if not possible_moves.bits:
+            current_player = self.controller.get_current_player()
             logger.debug(
-                "   No moves available for %s player. Skipping turn.",
-                self.controller.get_current_player(),
-            )
-            print(
-                f"No valid moves for {self.controller.get_current_player().name}. Skipping turn."
+                "   No moves available for %s player. Skipping turn.", current_player
             )
+            print(f"No valid moves for {current_player.name}. Skipping turn.")
 
         return False
 
@@ -105,13 +112,15 @@ class OthelloCLI:
             "Entering display_possible_moves function from cli.py,"
             " with parameter possible_moves."
         )
-        logger.debug("   Available moves:\n%s", str(possible_moves))
-        print("Possible moves: ")
-        for y_coord in range(self.controller.size.value):
-            for x_coord in range(self.controller.size.value):
-                if possible_moves.get(x_coord, y_coord):
-                    print(f"{chr(ord('a') + x_coord)}{y_coord + 1}", end=" ")
-        print()
+        logger.debug("   Available moves:\n%s", possible_moves)
+        # only the hot bits are visited, in the same row by row order as the grid
+        print(
+            "Possible moves: \n"
+            + " ".join(
+                SQUARE_NAMES[y_coord][x_coord]
+                for x_coord, y_coord in possible_moves.hot_bits_coordinates()
+            )
+        )
 
     @staticmethod
     def get_player_move():
@@ -125,14 +134,17 @@ class OthelloCLI:
 
         :return: A tuple containing the x and y coordinates of the move.
         :rtype: tuple[int, int]
+        :raises ValueError: If the input is not a letter followed by a number.
         """
         logger.debug("Entering get_player_move function from cli.py.")
         move = input("Enter your move: ").strip().lower()
         logger.debug("   Player entered: %s", move)
 
-        x_coord = ord(move[0]) - ord("a")
-        y_coord = int(move[1]) - 1
-        return x_coord, y_coord
+        match = MOVE_INPUT_REGEX.fullmatch(move)
+        if match is None:
+            raise ValueError(f"Invalid move: '{move}'")
+        column, row = match.groups()
+        return ord(column) - ord("a"), int(row) - 1
 
     def process_move(self, x_coord, y_coord, possible_moves):
         """
@@ -232,7 +244,9 @@ class OthelloCLI:
                 case CommandKind.RESTART:
                     logger.debug("   Executing %s command.", command_kind)
                     self.controller.restart()
-                    self.play()
+                    # redraw and let the running loop carry on, rather than
+                    # nesting a new game loop on the stack at every restart
+                    self.controller.post_play_callback()
                     logger.debug("   Board restarted to initial state")
                 case CommandKind.QUIT:
                     logger.debug("   Executing %s command.", command_kind)
@@ -269,11 +283,7 @@ class OthelloCLI:
         The loop continues until the game is over, or the user quits.
         """
         logger.debug("Entering play function from cli.py.")
-        self.parser = CommandParser(board_size=self.controller.size.value)
-
-        possible_moves = self.controller.get_possible_moves(
-            self.controller.get_current_player()
-        )
+        self.parser = get_command_parser(self.controller.size.value)
 
         def human_play_callback():
             if self.blitz_mode:
@@ -282,11 +292,11 @@ class OthelloCLI:
             logger.debug("   Player input: '%s'.", command_str)
             try:
                 command_kind, *args = self.parser.parse_str(command_str)
-                self.check_parser_input(command_str, command_kind, *args)
-
             except CommandParserException as err:
                 print(f"Error: {err}\nInvalid command. Please try again.")
                 self.parser.print_help()
+                return
+            self.check_parser_input(command_str, command_kind, *args)
 
         def turn_display():
             print(f"=== turn {self.controller.get_turn_number()} ===")
@@ -304,6 +314,11 @@ class OthelloCLI:
         self.running = True
 
         while self.running:
+            # cached by the controller, so iterations that did not change the board
+            # (help, rules, invalid input...) do not generate the moves again
+            possible_moves = self.controller.get_possible_moves(
+                self.controller.get_current_player()
+            )
             if self.check_game_over(possible_moves):
                 self.running = False
             else:
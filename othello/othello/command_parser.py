@@ -1,12 +1,14 @@
 """A class to help parsing cli user input."""
 
-import re
 from dataclasses import dataclass
 from enum import Enum, auto
+from functools import lru_cache
 from typing import Literal
 import argparse
 import logging
 
+from othello.othello_board import SQUARE_NAMES
+
 logger = logging.getLogger("Othello")
 
 
@@ -82,12 +84,13 @@ class CommandParser:
         # Fix to include the last column
         str_board_max_column = chr(ord("a") + board_size - 1)
         str_board_max_line = board_size
-        column_rx = rf"[a-{str_board_max_column}]"
-        line_rx = rf"[1-{str_board_max_line}]"
-        command_regex_str = rf"(\?|{column_rx}{line_rx}|restart|r|sh|s|ff|q)"
-        move_regex_str = rf"(({column_rx})({line_rx}))"
-        self.command_regex = re.compile(command_regex_str)
-        self.move_regex = re.compile(move_regex_str)
+        # every square of the board by name, a move is then a single dict lookup and
+        # two digit rows ("a10" on the larger boards) need no special casing
+        self.squares: dict[str, tuple[int, int]] = {
+            SQUARE_NAMES[y_coord][x_coord]: (x_coord, y_coord)
+            for y_coord in range(board_size)
+            for x_coord in range(board_size)
+        }
 
         # Set up argparse for help display
         self.help_parser = argparse.ArgumentParser(
@@ -202,20 +205,25 @@ class CommandParser:
         :raises CommandParserException: if the string is invalid.
         """
         logger.debug("Entering parse_str from command_parser.py.")
-        if (matches := self.command_regex.fullmatch(command_str)) is None:
-            logger.debug("   Unrecognized string.")
-            raise CommandParserException(command_str)
-
-        if (match_result := matches.group(1)) in COMMAND_MAP:
-            return (COMMAND_MAP[match_result],)
-
-        play_matches = self.move_regex.match(match_result)
-        col_raw = play_matches.group(2)
-        line_raw = play_matches.group(3)
-        if col_raw is None or line_raw is None:
-            logger.debug("   Unrecognized string.")
-            raise CommandParserException(command_str)
-        move_x_coord = ord(col_raw) - ord("a")
-        move_y_coord = int(line_raw) - 1
-        play_command = PlayCommand(move_x_coord, move_y_coord)
-        return (CommandKind.PLAY_MOVE, play_command)
+        if (coordinates := self.squares.get(command_str)) is not None:
+            return (CommandKind.PLAY_MOVE, PlayCommand(*coordinates))
+
+        if (command_kind := COMMAND_MAP.get(command_str)) is not None:
+            return (command_kind,)
+
+        logger.debug("   Unrecognized string.")
+        raise CommandParserException(command_str)
+
+
+@lru_cache(maxsize=4)
+def get_command_parser(board_size: int) -> CommandParser:
+    """
+    Returns the CommandParser for `board_size`, built once per size: parsers hold no
+    game state, so a restarted or new game reuses the square lookup and help parser.
+
+    :param board_size: The size of the board
+    :type board_size: int
+    :return: The command parser for that board size
+    :rtype: CommandParser
+    """
+    return CommandParser(board_size=board_size)
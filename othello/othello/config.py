@@ -14,66 +14,93 @@ Configuration Options:
     - ai_depth: 3/X (root_depth = 0)
     - ai_heuristic: default/custom
     - ai_time: 5/X (seconds)
+    - ai_workers: 1/X (processes searching the root moves)
 """
 
+from __future__ import annotations
+
+import os
+import re
 import sys
 import logging
+from typing import TYPE_CHECKING
 
-from othello.controllers import GameController
 import othello.logger as log
 
+if TYPE_CHECKING:
+    # only used in annotations, a runtime import would pull in the whole AI chain
+    from othello.controllers import GameController
+
 logger = logging.getLogger("Othello")
 SEPARATOR = "="
+TMP_SUFFIX = ".tmp"
+KEY_VALUE_REGEX = re.compile(rf"([^{SEPARATOR}]*){SEPARATOR}(.*)")
+
+
+def _atomic_write(filename: str, content: str) -> None:
+    """
+    Write `content` into `filename` through a temporary file that is then moved
+    into place, so an interrupted write never leaves a truncated file behind.
+    """
+    tmp_filename = filename + TMP_SUFFIX
+    with open(tmp_filename, "w", encoding="utf-8") as file:
+        file.write(content)
+    os.replace(tmp_filename, filename)
+
+
+def _format_value(value) -> str:
+    """Format a configuration value the way it is written in a .othellorc file."""
+    if value is True or value is False:
+        return "true" if value else "false"
+    return str(value)
 
 
 def save_config(config: dict, filename_prefix: str = "current_config") -> None:
     """Save configuration into a .othellorc file."""
-    logger.debug(
-        "Saving configuration: %s with filename_prefix: %s", config, filename_prefix
-    )
     filename = f"{filename_prefix}.othellorc"
 
     try:
         file_content = "\n".join(
-            f"{key}{SEPARATOR}{str(value).lower() if isinstance(value, bool) else value}"
-            for key, value in config.items()
+            f"{key}{SEPARATOR}{_format_value(value)}" for key, value in config.items()
         )
     except Exception as err:
         log.log_error_message(err, "Failed to format configuration.")
         raise
 
     try:
-        with open(filename, "w", encoding="utf-8") as file:
-            file.write(file_content)
+        _atomic_write(filename, file_content)
     except IOError as err:
         log.log_error_message(err, context="Error while saving configuration.")
         raise
 
-    logger.debug("Configuration saved successfully with %d entries.", len(config))
+    logger.debug(
+        "Configuration saved successfully to %s with %d entries: %s",
+        filename,
+        len(config),
+        config,
+    )
 
 
 def load_config(filename_prefix: str = "current_config") -> dict:
     """Load a configuration from a .othellorc file."""
-    logger.debug("Loading configuration with filename_prefix: %s", filename_prefix)
     filename = f"{filename_prefix}.othellorc"
     config = {}
 
     try:
+        # an empty config is valid, no need to open it to find that out
+        if not os.stat(filename).st_size:
+            logger.debug("Configuration loaded from empty file %s.", filename)
+            return config
         with open(filename, "r", encoding="utf-8") as file:
-            lines = file.readlines()
+            # stream the file line by line rather than materializing it with readlines()
+            for line in file:
+                if (matches := KEY_VALUE_REGEX.fullmatch(line.strip())) is not None:
+                    config[matches.group(1)] = matches.group(2)
     except FileNotFoundError as err:
         log.log_error_message(err, context="No configuration file found.")
         raise
 
-    try:
-        for line in lines:
-            if SEPARATOR in line:
-                key, value = line.strip().split(SEPARATOR, 1)
-                config[key] = value
-    except ValueError as err:
-        log.log_error_message(err, "Invalid configuration format.")
-        raise
-
+    logger.debug("Configuration loaded from %s with %d entries.", filename, len(config))
     return config
 
 
@@ -94,11 +121,9 @@ def save_board_state_history(
     filename = f"{filename_prefix}.sav"
 
     try:
-        with open(filename, "w", encoding="utf-8") as file:
-            if only_hist:
-                file.write(controller.export_history())
-            else:
-                file.write(controller.export())
+        _atomic_write(
+            filename, controller.export_history() if only_hist else controller.export()
+        )
         print(f"Game saved in {filename_prefix}.sav")
     except IOError as err:
         log.log_error_message(
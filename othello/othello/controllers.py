@@ -3,26 +3,53 @@
 from __future__ import annotations
 
 
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import deepcopy
 import logging
-from random import choice
 import time
 
-from othello.ai_features import find_best_move
+from othello.ai_features import (
+    TT_BITS,
+    TranspositionTable,
+    find_best_move,
+    ordered_moves,
+    resolve_heuristic,
+)
+from othello.bitboard import Bitboard
 from othello.othello_board import (
+    ZOBRIST_SIDE,
     Color,
     OthelloBoard,
 )
-from othello.blitz_timer import BlitzTimer
+from othello.blitz_timer import PLAYER_KEYS, BlitzTimer
 from othello.parser import DEFAULT_BLITZ_TIME
 
 logger = logging.getLogger("Othello")
 
+LEGAL_MOVES_CACHE_SIZE = 1 << 16
+
+# (timer key, winner, game over message) when that timer runs out, black first
+BLITZ_TIMEOUTS = (
+    (PLAYER_KEYS[Color.BLACK.index], Color.WHITE, "Black's time is up! White wins!"),
+    (PLAYER_KEYS[Color.WHITE.index], Color.BLACK, "White's time is up! Black wins!"),
+)
+
+
+def _noop():
+    """
+    Default post play callback, so that `play` can call it unconditionally.
+    """
+
 
-class Player:
+class Player(ABC):
     """
     Base class for a player in the game.
     """
 
+    __slots__ = ("controller", "color")
+    is_human = False
+
     def __init__(self):
         """
         Player initialization.
@@ -48,6 +75,12 @@ class Player:
         """
         self.color = color
 
+    def restart(self):
+        """
+        Called when the controller restarts the game, does nothing by default.
+        """
+
+    @abstractmethod
     def next_move(self):
         """
         Base method for determining the next move.
@@ -61,6 +94,9 @@ class HumanPlayer(Player):
     Triggers the human play callback when it's time to make a move.
     """
 
+    __slots__ = ()
+    is_human = True
+
     def next_move(self):
         """
         Signal that it's time for the human player to make a move.
@@ -78,15 +114,16 @@ class RandomPlayer(Player):
     Player class that makes random moves selected from available legal moves.
     """
 
+    __slots__ = ()
+
     def next_move(self):
         """
         Choose a random legal move and play it on the board.
         """
         if self.controller is not None and self.color is not None:
-            move = choice(
-                self.controller.get_possible_moves(self.color).hot_bits_coordinates()
+            self.controller.play_idx(
+                self.controller.get_possible_moves(self.color).random_hot_bit_index()
             )
-            self.controller.play(move[0], move[1])
 
 
 class AIPlayer(Player):
@@ -94,13 +131,28 @@ class AIPlayer(Player):
     Player class that uses AI algorithms to determine the next move.
     """
 
+    __slots__ = (
+        "board",
+        "depth",
+        "algorithm",
+        "heuristic",
+        "heuristic_function",
+        "benchmark",
+        "workers",
+        "transposition_table",
+        "_executor",
+        "_searching",
+    )
+
     def __init__(
         self,
         board: OthelloBoard,
         depth: int = 3,
-        algorithm: str = "minimax",
+        algorithm: str = "alphabeta",
         heuristic: str = "coin_parity",
         benchmark: bool = False,
+        workers: int = 1,
+        tt_bits: int = TT_BITS,
     ):
         """
         Initialize an AI player.
@@ -109,39 +161,227 @@ class AIPlayer(Player):
         :type board: OthelloBoard
         :param depth: The depth of the search algorithm, defaults to 3
         :type depth: int, optional
-        :param algorithm: The search algorithm to use, defaults to "minimax"
+        :param algorithm: The search algorithm to use, defaults to "alphabeta"
         :type algorithm: str, optional
         :param heuristic: The heuristic function to evaluate board positions,
             defaults to "coin_parity"
         :type heuristic: str, optional
+        :param workers: The number of processes searching the root moves in parallel,
+            defaults to 1 (no parallelism)
+        :type workers: int, optional
+        :param tt_bits: log2 of the number of buckets of the transposition table
+        :type tt_bits: int, optional
         """
         super().__init__()
         self.board = board
         self.depth = depth
         self.algorithm = algorithm
         self.heuristic = heuristic
+        # resolved once here rather than on every search
+        self.heuristic_function = resolve_heuristic(heuristic)
         self.benchmark = benchmark
+        self.workers = workers
+        # kept across turns: positions searched last turn are often reached again,
+        # and the entries only depend on this player's color and heuristic
+        self.transposition_table = TranspositionTable(tt_bits)
+        self._executor: ThreadPoolExecutor | None = None
+        # position hash of the background search in flight, if any
+        self._searching: int | None = None
 
     def next_move(self):
         """
         Determine the best move using specified AI algorithm and heuristic,
         then play it on the board.
 
+        If the controller has a `ui_dispatch_callback`, the search runs in a background
+        thread and the move is handed back through that callback so that the UI stays
+        responsive meanwhile. A position already being searched is not searched twice,
+        so repeated calls for the same turn play a single move.
+
         :raises Exception: if the controller is not defined
         """
-        if self.benchmark:
-            start_time = time.time()  # Start timer
+        if self.controller is None:
+            return
 
-        if self.controller is not None:
-            move = find_best_move(
-                self.board, self.depth, self.color, self.algorithm, self.heuristic
-            )
+        dispatch = self.controller.ui_dispatch_callback
+        if dispatch is None:
+            move = self._timed_search(self.board, self._time_budget(self.board))
             self.controller.play(move[0], move[1])
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="othello-ai"
+            )
+        position = self.board.position_hash()
+        if self._searching == position:
+            logger.debug("Already searching position %x.", position)
+            return
+        self._searching = position
+        # the worker searches a snapshot taken here, on the UI thread, as the live
+        # board may be played on or restarted meanwhile; the time budget is read here
+        # too, as reading the blitz timer updates it under the UI's feet
+        board = deepcopy(self.board)
+        search = self._executor.submit(
+            self._timed_search, board, self._time_budget(board)
+        )
+        search.add_done_callback(
+            lambda done: self._search_done(dispatch, position, done)
+        )
+
+    def _search_done(self, dispatch, position: int, done: Future):
+        """
+        Hands the outcome of a background search back to the UI thread. Runs in the
+        worker thread, where an exception raised by `done.result()` would only be
+        logged by concurrent.futures.
+
+        :param dispatch: The controller's `ui_dispatch_callback`
+        :param position: The position hash of the board the search started on
+        :param done: The future of the search
+        """
+        if done.cancelled():
+            dispatch(self._search_failed, position, None)
+        elif (error := done.exception()) is not None:
+            dispatch(self._search_failed, position, error)
+        else:
+            dispatch(self._play_searched, position, done.result())
+
+    def _search_failed(self, position: int, error: BaseException | None):
+        """
+        Forgets about a background search that raised or was cancelled, so that the
+        position can be searched again, and logs the error if any.
+
+        :param position: The position hash of the board the search started on
+        :param error: The exception raised by the search, None if it was cancelled
+        """
+        if self._searching == position:
+            self._searching = None
+        if error is None:
+            logger.debug("AI search of position %x was cancelled.", position)
+        else:
+            # not raised on this thread, so the traceback is passed explicitly
+            logger.error("AI search of position %x failed.", position, exc_info=error)
+
+    def restart(self):
+        """
+        Forgets about the search in flight, if any: its result is dropped by
+        `_play_searched` unless the restarted game reaches the same position, which
+        must not be blocked from being searched again.
+        """
+        self._searching = None
+
+    def _play_searched(self, position: int, move: tuple[int, int]):
+        """
+        Plays a move found in the background, unless the game moved on meanwhile
+        (restart, undo...).
+
+        :param position: The position hash of the board the search started on
+        :param move: The move found by the search
+        """
+        if self._searching == position:
+            self._searching = None
+        if self.board.position_hash() != position:
+            logger.debug("Dropping AI move %s, the position changed.", move)
+            return
+        self.controller.play(move[0], move[1])
+
+    def _timed_search(
+        self, board: OthelloBoard, time_budget: float | None
+    ) -> tuple[int, int]:
+        """
+        Runs `_search`, printing how long it took in benchmark mode.
+
+        :param board: The board to search
+        :param time_budget: The time budget of `_time_budget`
+        :return: The coordinates of the best move
+        :rtype: tuple[int, int]
+        """
+        if not self.benchmark:
+            return self._search(board, time_budget)
+
+        start_time = time.time()  # Start timer
+        move = self._search(board, time_budget)
+        execution_time = time.time() - start_time
+        print(f"Execution time: {execution_time:.4f} seconds")
+        return move
+
+    def _search(
+        self, board: OthelloBoard, time_budget: float | None
+    ) -> tuple[int, int]:
+        """
+        Searches the best move for the current position.
+
+        Alphabeta is deepened iteratively from depth 1 to `self.depth`, each iteration
+        searching the previous best move first. In blitz mode the deepening stops once
+        half of this move's share of the remaining time is spent, as the next depth
+        would likely take longer than all the previous ones together, and the best move
+        of the last completed depth is returned.
+
+        :param board: The board to search
+        :param time_budget: The time budget of `_time_budget`, None for no limit
+        :return: The coordinates of the best move
+        :rtype: tuple[int, int]
+        """
+        self.transposition_table.new_search()
+        if self.algorithm == "minimax":
+            return find_best_move(
+                board,
+                self.depth,
+                self.color,
+                self.algorithm,
+                self.heuristic_function,
+                transposition_table=self.transposition_table,
+            )
 
-        if self.benchmark:
-            end_time = time.time()  # End timer
-            execution_time = end_time - start_time
-            print(f"Execution time: {execution_time:.4f} seconds")
+        start_time = time.time()
+        move = (-1, -1)
+        # the root moves do not change from one depth to the next
+        root_moves = ordered_moves(
+            board.line_cap_move(board.current_player).bits,
+            board.size.value,
+        )
+        for depth in range(1, self.depth + 1):
+            move = find_best_move(
+                board,
+                depth,
+                self.color,
+                self.algorithm,
+                self.heuristic_function,
+                transposition_table=self.transposition_table,
+                pv_hint=move,
+                workers=self.workers,
+                root_moves=root_moves,
+            )
+            if time_budget is not None and time.time() - start_time >= time_budget / 2:
+                logger.debug(
+                    "Search stopped at depth %d, time budget of %.2fs spent.",
+                    depth,
+                    time_budget,
+                )
+                break
+        return move
+
+    def _time_budget(self, board: OthelloBoard) -> float | None:
+        """
+        Returns the time this move may take in blitz mode: the remaining time split
+        evenly over the moves this player still has to play, estimated as half of the
+        empty squares. Reads the blitz timer, so it must run on the thread driving the
+        game rather than in the background search.
+
+        :param board: The board to search
+        :return: The time budget in seconds, None outside of blitz mode and for
+            minimax, which is not deepened iteratively
+        :rtype: float | None
+        """
+        if self.algorithm == "minimax" or not self.controller.is_blitz():
+            return None
+        remaining_time = self.controller.blitz.get_remaining_time(
+            PLAYER_KEYS[self.color.index]
+        )
+        empty_squares = (
+            board.size.value**2 - board.black.popcount() - board.white.popcount()
+        )
+        return remaining_time / max(1, empty_squares // 2)
 
 
 class GameController:
@@ -172,23 +412,28 @@ class GameController:
         self._board = board
         self.size = board.size
         self.first_player_human = True
-        self.post_play_callback = None
         self.blitz = None
         if blitz_mode:
             self.blitz = BlitzTimer(time_limit)
-            self.blitz.start_timer("black")
+            self.blitz.start_timer(PLAYER_KEYS[Color.BLACK.index])
         self.time_limit = time_limit if time_limit is not None else DEFAULT_BLITZ_TIME
         self.human_play_callback = None
-        self.post_play_callback = None
+        self.post_play_callback = _noop
+        # when set, AI players search in a background thread and call it with a
+        # function and its arguments, it must run them on the UI thread
+        self.ui_dispatch_callback = None
         black_player.attach(self)
         black_player.set_color(Color.BLACK)
         white_player.attach(self)
         white_player.set_color(Color.WHITE)
-        self.players = {Color.BLACK: black_player, Color.WHITE: white_player}
+        # indexed by `Color.index`: 0 for black, 1 for white
+        self.players = [black_player, white_player]
+        self._is_human = (black_player.is_human, white_player.is_human)
         self.is_game_over = False
         self.game_over_message = ""
         self.winner: Color | None
         self.logger = logging.getLogger("Othello")
+        self._legal_moves_cache: dict[int, Bitboard] = {}
 
     def is_blitz(self) -> bool:
         """
@@ -209,18 +454,16 @@ class GameController:
         """
         Call the next_move method of the player whose turn it currently is.
         """
-        self.players[self._board.current_player].next_move()
+        self.players[self._board.current_player.index].next_move()
 
     def _check_for_blitz_game_over(self):
         if self.blitz is not None:
-            if self.blitz.is_time_up("black"):
-                self.is_game_over = True
-                self.winner = Color.WHITE
-                self.game_over_message = "Black's time is up! White wins!"
-            elif self.blitz.is_time_up("white"):
-                self.is_game_over = True
-                self.winner = Color.BLACK
-                self.game_over_message = "White's time is up! Black wins!"
+            for player_key, winner, message in BLITZ_TIMEOUTS:
+                if self.blitz.is_time_up(player_key):
+                    self.is_game_over = True
+                    self.winner = winner
+                    self.game_over_message = message
+                    return
 
     def play(self, x_coord: int, y_coord: int):
         """
@@ -266,11 +509,27 @@ class GameController:
                 self.game_over_message = "The game is a tie!"
                 self.winner = None
 
-        if self.post_play_callback is not None:
-            self.post_play_callback()
+        self._after_play()
+
+    def play_idx(self, idx: int):
+        """
+        Same as `play` with the move given as a bit index (y * size + x), as found in
+        the Bitboards, so that players do not need to build coordinates.
+
+        :param idx: The bit index of the move
+        """
+        y_coord, x_coord = divmod(idx, self.size.value)
+        self.play(x_coord, y_coord)
+
+    def _after_play(self):
+        """
+        Runs once a move has been played: notifies the post play callback and hands the
+        blitz clock over to the player to move. Override this rather than `play` to
+        react to moves.
+        """
+        self.post_play_callback()
         if self.blitz is not None:
-            current = "black" if self.get_current_player() == Color.BLACK else "white"
-            self.blitz.change_player(current)
+            self.blitz.change_player(PLAYER_KEYS[self.get_current_player().index])
 
     def display_time(self):
         """
@@ -284,10 +543,31 @@ class GameController:
         """
         Return a Bitboard of the possible moves for the given player.
 
+        Results are cached on the board's Zobrist hash with `player` folded in, the
+        returned Bitboard is shared and must not be modified.
+
         :param player: The player for which to get the possible moves
         :return: A Bitboard of the possible moves for the given player
         """
-        return self._board.line_cap_move(player)
+        key = self._board.zobrist
+        if player.index:
+            key ^= ZOBRIST_SIDE
+        if (moves := self._legal_moves_cache.get(key)) is None:
+            if len(self._legal_moves_cache) >= LEGAL_MOVES_CACHE_SIZE:
+                self._legal_moves_cache.clear()
+            moves = self._board.line_cap_move(player)
+            self._legal_moves_cache[key] = moves
+        return moves
+
+    def get_possible_moves_raw(self, player: Color) -> int:
+        """
+        Same as `get_possible_moves` but returns the raw bits (bit y * size + x is set
+        for a legal move at x, y), for callers working on ints rather than Bitboards.
+
+        :param player: The player for which to get the possible moves
+        :return: The bits of the possible moves for the given player
+        """
+        return self.get_possible_moves(player).bits
 
     def get_last_play(self):
         """
@@ -308,11 +588,7 @@ class GameController:
         :return: The number of pieces of the specified color on the board
         :rtype: int
         """
-        return (
-            self._board.black.popcount()
-            if color is Color.BLACK
-            else self._board.white.popcount()
-        )
+        return self._bitboard(color).popcount()
 
     def get_position(self, player: Color, x_coord: int, y_coord: int):
         """
@@ -329,9 +605,26 @@ class GameController:
         :return: True if the player's piece occupies the position, False otherwise.
         :rtype: bool
         """
+        return self._bitboard(player).get(x_coord, y_coord)
+
+    def get_pieces(self, player: Color) -> Bitboard:
+        """
+        Get the bitboard of the pieces of a given player, to go over all of them at
+        once rather than querying every position with `get_position`.
 
-        to_query = self._board.black if player is Color.BLACK else self._board.white
-        return to_query.get(x_coord, y_coord)
+        :param player: The player whose pieces are being queried.
+        :type player: Color
+        :return: The bitboard of the player's pieces, it must not be modified.
+        :rtype: Bitboard
+        """
+        return self._bitboard(player)
+
+    def _bitboard(self, color: Color) -> Bitboard:
+        """
+        Returns the bitboard of `color`. The board swaps its bitboards on every play,
+        so they are looked up each time rather than kept in the controller.
+        """
+        return (self._board.black, self._board.white)[color.index]
 
     def restart(self):
         """
@@ -342,10 +635,12 @@ class GameController:
         """
 
         self._board.restart()
+        for player in self.players:
+            player.restart()
         if self.is_blitz():
             del self.blitz
             self.blitz = BlitzTimer(self.time_limit)
-            self.blitz.start_timer("black")
+            self.blitz.start_timer(PLAYER_KEYS[Color.BLACK.index])
 
     def get_turn_number(self):
         """
@@ -379,7 +674,7 @@ class GameController:
         :return: True if the current player is a human player, False otherwise
         :rtype: bool
         """
-        return isinstance(self.players[self._board.current_player], HumanPlayer)
+        return self._is_human[self._board.current_player.index]
 
     def get_pieces_count(self, player_color: Color):
         """
@@ -393,12 +688,17 @@ class GameController:
         :return: The count of pieces on the board for the specified player color.
         :rtype: int
         """
+        return self.popcount(player_color)
 
-        return (
-            self._board.black.popcount()
-            if player_color is Color.BLACK
-            else self._board.white.popcount()
-        )
+    def get_both_counts(self) -> tuple[int, int]:
+        """
+        Get the count of pieces of both players at once, for the callers that always
+        need the two of them.
+
+        :return: The count of black pieces and the count of white pieces.
+        :rtype: tuple[int, int]
+        """
+        return self._board.black.bits.bit_count(), self._board.white.bits.bit_count()
 
     def get_history(self):
         """
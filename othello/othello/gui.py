@@ -167,6 +167,7 @@ class OthelloWindow(Gtk.ApplicationWindow):
         self.logger = logging.getLogger("Othello")
 
         controller.post_play_callback = self.__update_game_state
+        controller.ui_dispatch_callback = GLib.idle_add
 
         self.__init_game(controller)
         self.load_history()
@@ -316,12 +317,9 @@ class OthelloWindow(Gtk.ApplicationWindow):
 
     def _update_nb_pieces(self) -> None:
         """Update the piece count labels."""
-        self.black_nb_pieces.set_label(
-            f"Black has {self.controller.get_pieces_count(Color.BLACK)} pieces"
-        )
-        self.white_nb_pieces.set_label(
-            f"White has {self.controller.get_pieces_count(Color.WHITE)} pieces"
-        )
+        black_count, white_count = self.controller.get_both_counts()
+        self.black_nb_pieces.set_label(f"Black has {black_count} pieces")
+        self.white_nb_pieces.set_label(f"White has {white_count} pieces")
 
     def _update_timers_thread(self) -> None:
         """
@@ -410,7 +408,7 @@ class OthelloWindow(Gtk.ApplicationWindow):
 
         color = (
             black_piece_color
-            if self.controller.get_current_player() == Color.BLACK
+            if self.controller.get_current_player() is Color.BLACK
             else white_piece_color
         )
         cairo_context.set_source_rgba(*color)
@@ -431,23 +429,15 @@ class OthelloWindow(Gtk.ApplicationWindow):
         black_piece_color = (0, 0, 0)
         white_piece_color = (1, 1, 1)
 
-        for col in range(self.grid_size):
-            for row in range(self.grid_size):
-                if not (
-                    self.controller.get_position(Color.BLACK, col, row)
-                    or self.controller.get_position(Color.WHITE, col, row)
-                ):
-                    continue
-
+        radius = self.cell_size // 2 - 2
+        for player, piece_color in (
+            (Color.BLACK, black_piece_color),
+            (Color.WHITE, white_piece_color),
+        ):
+            cairo_context.set_source_rgb(*piece_color)
+            for col, row in self.controller.get_pieces(player).hot_bits_coordinates():
                 center_x = col * self.cell_size + self.cell_size // 2
                 center_y = row * self.cell_size + self.cell_size // 2
-                radius = self.cell_size // 2 - 2
-
-                if self.controller.get_position(Color.BLACK, col, row):
-                    cairo_context.set_source_rgb(*black_piece_color)
-                else:
-                    cairo_context.set_source_rgb(*white_piece_color)
-
                 cairo_context.arc(center_x, center_y, radius, 0, 2 * math.pi)
                 cairo_context.fill()
 
@@ -6,10 +6,12 @@ Everything related to the actual board of Othello.
 from __future__ import annotations
 from copy import copy
 from enum import Enum
+from functools import lru_cache
 from string import ascii_lowercase
 import logging
+import random
 
-from othello.bitboard import Bitboard, Direction
+from othello.bitboard import Bitboard, BitboardProperties, Direction
 
 logger = logging.getLogger("Othello")
 
@@ -24,12 +26,15 @@ class Color(Enum):
     POSSIBLE = "·"
     EMPTY = "_"
 
+    def __init__(self, symbol: str):
+        # 0 for black and 1 for white, to index per color tuples. Reading it is a plain
+        # attribute access, unlike `Color.WHITE` which goes through the enum metaclass.
+        self.index = {"X": 0, "O": 1}.get(symbol)
+
     def __invert__(self) -> Color:
-        if self is Color.BLACK:
-            return Color.WHITE
-        if self is Color.WHITE:
-            return Color.BLACK
-        return Color.EMPTY
+        if self.index is None:
+            return Color.EMPTY
+        return _OPPONENTS[self.index]
 
     def __str__(self) -> str:
         if self is Color.BLACK:
@@ -39,6 +44,10 @@ class Color(Enum):
         return "empty"
 
 
+# the opponent of each player, indexed by `Color.index`
+_OPPONENTS = (Color.WHITE, Color.BLACK)
+
+
 class IllegalMoveException(Exception):
     """
     Thrown when the user tries to push an illegal move
@@ -86,10 +95,69 @@ class BoardSize(Enum):
         :returns: A BoardSize member with the corresponding value if it is a legal value
         :raises: IllegalBoardSizeException on illegal board size value
         """
-        reversed_dep = {bs.value: bs for bs in BoardSize}
-        if value in reversed_dep:
-            return reversed_dep[value]
-        raise IllegalBoardSizeException(value)
+        try:
+            return BoardSize(value)
+        except ValueError:
+            raise IllegalBoardSizeException(value) from None
+
+
+# one random key per (square, color) sized for the largest board, smaller boards only
+# use a prefix of it. Seeded so that hashes are stable from one run to another.
+_ZOBRIST_RNG = random.Random(0x07E110)
+ZOBRIST: tuple[tuple[int, int], ...] = tuple(
+    (_ZOBRIST_RNG.getrandbits(64), _ZOBRIST_RNG.getrandbits(64))
+    for _ in range(max(bs.value for bs in BoardSize) ** 2)
+)
+# XORed in when white is to move, see `OthelloBoard.position_hash`
+ZOBRIST_SIDE: int = _ZOBRIST_RNG.getrandbits(64)
+# algebraic name of every square as SQUARE_NAMES[y][x], sized for the largest board
+SQUARE_NAMES: tuple[tuple[str, ...], ...] = tuple(
+    tuple(
+        f"{ascii_lowercase[x_coord]}{y_coord + 1}"
+        for x_coord in range(max(bs.value for bs in BoardSize))
+    )
+    for y_coord in range(max(bs.value for bs in BoardSize))
+)
+
+
+def zobrist_bits(bits: int, color_index: int) -> int:
+    """
+    XORs together the Zobrist keys of every set bit of `bits`.
+
+    :param bits: The raw bits of a bitboard
+    :param color_index: 0 for the black keys, 1 for the white keys
+    :returns: The Zobrist contribution of those bits
+    :rtype: int
+    """
+    key = 0
+    while bits:
+        lowest = bits & -bits
+        key ^= ZOBRIST[lowest.bit_length() - 1][color_index]
+        bits ^= lowest
+    return key
+
+
+@lru_cache(maxsize=None)
+def shift_directions(
+    size: int,
+) -> tuple[tuple[tuple[int, int], ...], tuple[tuple[int, int], ...]]:
+    """
+    Returns the (shift, edge mask) pairs of the eight directions, split between
+    left shifts and right shifts. The edge mask drops the bits that wrapped around
+    a side of the board.
+
+    :param size: The size of the board
+    :returns: The left shift directions and the right shift directions
+    :rtype: tuple[tuple[tuple[int, int], ...], tuple[tuple[int, int], ...]]
+    """
+    properties = BitboardProperties.get(size)
+    mask = properties.mask
+    west_mask = properties.west_mask & mask
+    east_mask = properties.east_mask & mask
+    return (
+        ((size, mask), (1, west_mask), (size + 1, west_mask), (size - 1, east_mask)),
+        ((size, mask), (1, east_mask), (size - 1, west_mask), (size + 1, east_mask)),
+    )
 
 
 class OthelloBoard:
@@ -97,6 +165,20 @@ class OthelloBoard:
     Implementation of an othello board that uses Bitboards
     """
 
+    __slots__ = (
+        "size",
+        "current_player",
+        "black",
+        "white",
+        "mask",
+        "zobrist",
+        "__history",
+        "forced_game_over",
+        "__moves_p",
+        "__moves_o",
+        "__moves_bits",
+    )
+
     def __init__(
         self,
         size: BoardSize,
@@ -135,8 +217,13 @@ class OthelloBoard:
             self.__init_board()
         self.mask = self.black.mask
         logger.debug("Board mask initialized: %d.", self.mask)
+        self.zobrist = self.compute_zobrist()
         self.__history: list[tuple[Bitboard, Bitboard, int, int, Color]] = []
         self.forced_game_over = False
+        # last result of `legal_moves_bits` and the bits it was computed for, -1 never
+        # matches actual bits
+        self.__moves_p = self.__moves_o = -1
+        self.__moves_bits = 0
 
     def __init_board(self):
         """
@@ -151,6 +238,36 @@ class OthelloBoard:
         self.black.set(self.size.value // 2 - 1, self.size.value // 2, True)
         self.black.set(self.size.value // 2, self.size.value // 2 - 1, True)
 
+    def compute_zobrist(self) -> int:
+        """
+        Computes the Zobrist hash of the discs on the board from scratch.
+        `play` and `pop` keep `self.zobrist` up to date incrementally.
+
+        :returns: The Zobrist hash of the current position
+        :rtype: int
+        """
+        return zobrist_bits(self.black.bits, 0) ^ zobrist_bits(self.white.bits, 1)
+
+    def position_hash(self) -> int:
+        """
+        Returns the Zobrist hash of the position, side to move included.
+
+        :returns: `self.zobrist`, XORed with `ZOBRIST_SIDE` when white is to move
+        :rtype: int
+        """
+        if self.current_player.index:
+            return self.zobrist ^ ZOBRIST_SIDE
+        return self.zobrist
+
+    def __zobrist_delta(self, black: Bitboard, white: Bitboard) -> int:
+        """
+        Returns what has to be XORed into `self.zobrist` to go from the current
+        discs to `black` and `white`, only the squares that differ are visited.
+        """
+        return zobrist_bits(self.black.bits ^ black.bits, 0) ^ zobrist_bits(
+            self.white.bits ^ white.bits, 1
+        )
+
     def force_game_over(self):
         """
         Force the game to be over.
@@ -162,62 +279,93 @@ class OthelloBoard:
         """
         Checks whether or not a board is in a game over state.
         """
-        logger.debug("Checking if game is over in othello_board.py.")
-        move_1, move_2 = (
-            self.line_cap_move(self.current_player),
-            self.line_cap_move(~self.current_player),
-        )
-        return self.forced_game_over or (
-            not move_1.popcount() and not move_2.popcount()
+        bits_p, bits_o = self.black.bits, self.white.bits
+        if self.current_player.index:
+            bits_p, bits_o = bits_o, bits_p
+        return (
+            self.forced_game_over
+            # a full board needs no move generation
+            or bits_p | bits_o == self.mask
+            # the side to move first, play() has just generated its moves
+            or (
+                not self.legal_moves_bits(bits_p, bits_o)
+                and not self.legal_moves_bits(bits_o, bits_p)
+            )
         )
 
+    def legal_moves_bits(self, own: int, opponent: int) -> int:
+        """
+        Same as `shift_along(opponent, own)`, remembering the last result. The moves of
+        a position are asked for by the pass check of `play`, then by `is_game_over`,
+        then by the search or the display, and by the legality check of the next
+        `play`: all of them but the first get the remembered bits.
+
+        :param own: The bits of the player to generate moves for
+        :param opponent: The bits of their opponent
+        :returns: The bits of the legal moves
+        :rtype: int
+        """
+        if own == self.__moves_p and opponent == self.__moves_o:
+            return self.__moves_bits
+        moves_bits = self.shift_along(opponent, own)
+        self.__moves_p, self.__moves_o, self.__moves_bits = own, opponent, moves_bits
+        return moves_bits
+
     def shift_along(self, bits_o, bits_p):
         """
         inlining of the shift from bitboard in order to gain ALOT of speed
-        """
-        size = self.size.value
-        mask = self.black.mask
-        west_mask = self.black.west_mask
-        east_mask = self.black.east_mask
 
-        empty_bits = (~(bits_p | bits_o)) & mask
+        The eight directions go through the same `shift_directions` table as
+        `capture_bits`. Every square reached past a run of opponent discs is
+        collected and the non empty ones are dropped once at the end, so each step
+        of a run costs a single shift.
+        """
+        left_shifts, right_shifts = shift_directions(self.size.value)
 
         moves_bits = 0
-
-        # define all shift operations as inline functions
-        tmp = bits_o & ((bits_p >> size) & mask)
-        while tmp:
-            moves_bits |= empty_bits & ((tmp >> size) & mask)
-            tmp = bits_o & ((tmp >> size) & mask)
-        tmp = bits_o & ((bits_p << size) & mask)
-        while tmp:
-            moves_bits |= empty_bits & ((tmp << size) & mask)
-            tmp = bits_o & ((tmp << size) & mask)
-        tmp = bits_o & (((bits_p << 1) & west_mask) & mask)
-        while tmp:
-            moves_bits |= empty_bits & (((tmp << 1) & west_mask) & mask)
-            tmp = bits_o & (((tmp << 1) & west_mask) & mask)
-        tmp = bits_o & (((bits_p >> 1) & east_mask) & mask)
-        while tmp:
-            moves_bits |= empty_bits & (((tmp >> 1) & east_mask) & mask)
-            tmp = bits_o & (((tmp >> 1) & east_mask) & mask)
-        tmp = bits_o & (((bits_p >> (size - 1)) & west_mask) & mask)
-        while tmp:
-            moves_bits |= empty_bits & (((tmp >> (size - 1)) & west_mask) & mask)
-            tmp = bits_o & (((tmp >> (size - 1)) & west_mask) & mask)
-        tmp = bits_o & (((bits_p >> (size + 1)) & east_mask) & mask)
-        while tmp:
-            moves_bits |= empty_bits & (((tmp >> (size + 1)) & east_mask) & mask)
-            tmp = bits_o & (((tmp >> (size + 1)) & east_mask) & mask)
-        tmp = bits_o & (((bits_p << (size + 1)) & west_mask) & mask)
-        while tmp:
-            moves_bits |= empty_bits & (((tmp << (size + 1)) & west_mask) & mask)
-            tmp = bits_o & (((tmp << (size + 1)) & west_mask) & mask)
-        tmp = bits_o & (((bits_p << (size - 1)) & east_mask) & mask)
-        while tmp:
-            moves_bits |= empty_bits & (((tmp << (size - 1)) & east_mask) & mask)
-            tmp = bits_o & (((tmp << (size - 1)) & east_mask) & mask)
-        return moves_bits
+        for amount, edge_mask in left_shifts:
+            tmp = bits_o & (bits_p << amount) & edge_mask
+            while tmp:
+                tmp = (tmp << amount) & edge_mask
+                moves_bits |= tmp
+                tmp &= bits_o
+        for amount, edge_mask in right_shifts:
+            tmp = bits_o & (bits_p >> amount) & edge_mask
+            while tmp:
+                tmp = (tmp >> amount) & edge_mask
+                moves_bits |= tmp
+                tmp &= bits_o
+        return moves_bits & ~(bits_p | bits_o)
+
+    def capture_bits(self, move_bits: int, bits_p: int, bits_o: int) -> int:
+        """
+        Raw int counterpart of `line_cap`, same shifts and masks as `shift_along`.
+
+        :param move_bits: The single bit of the play
+        :param bits_p: The bits of the player making the move
+        :param bits_o: The bits of the opponent
+        :returns: The bits of the play and of every captured disc
+        """
+        left_shifts, right_shifts = shift_directions(self.size.value)
+
+        captured = move_bits
+        for amount, edge_mask in left_shifts:
+            line = 0
+            ptr = (move_bits << amount) & edge_mask
+            while ptr & bits_o:
+                line |= ptr
+                ptr = (ptr << amount) & edge_mask
+            if ptr & bits_p:
+                captured |= line
+        for amount, edge_mask in right_shifts:
+            line = 0
+            ptr = (move_bits >> amount) & edge_mask
+            while ptr & bits_o:
+                line |= ptr
+                ptr = (ptr >> amount) & edge_mask
+            if ptr & bits_p:
+                captured |= line
+        return captured
 
     def line_cap_move(self, current_player: Color) -> Bitboard:
         """
@@ -226,10 +374,10 @@ class OthelloBoard:
         :param current_player: The player trying to do the capture
         :returns: A Bitboard of the possible capture moves for player `current_player`
         """
-        bits_p = self.black.bits if current_player is Color.BLACK else self.white.bits
-        bits_o = self.white.bits if current_player is Color.BLACK else self.black.bits
-
-        moves_bits = self.shift_along(bits_o, bits_p)
+        if current_player.index:
+            moves_bits = self.legal_moves_bits(self.white.bits, self.black.bits)
+        else:
+            moves_bits = self.legal_moves_bits(self.black.bits, self.white.bits)
         return Bitboard(self.size.value, moves_bits)
 
     def line_cap_move_(self, current_player: Color) -> Bitboard:
@@ -285,28 +433,13 @@ class OthelloBoard:
         :returns: The bitboard of the captured bits.
         :rtype: Bitboard
         """
-        bits_p = self.black if current_player is Color.BLACK else self.white
-        bits_o = self.white if current_player is Color.BLACK else self.black
+        bits_p = self.black.bits if current_player is Color.BLACK else self.white.bits
+        bits_o = self.white.bits if current_player is Color.BLACK else self.black.bits
         position = Bitboard(self.size.value)
         position.set(x_coord, y_coord, True)
-        cap_mask = Bitboard(self.size.value, bits=position.bits)
-        for shift_dir in Direction:
-            direction_mask = Bitboard(self.size.value, position.bits)
-            direction_ptr = Bitboard(self.size.value, position.bits)
-
-            while True:
-                # we can while True as we always ends up falling either in the elif
-                # or the else condition
-                direction_ptr = direction_ptr.shift(shift_dir)
-                if (direction_ptr & bits_o).bits:
-                    direction_mask |= direction_ptr
-                elif (direction_ptr & bits_p).bits:
-                    cap_mask |= direction_mask
-                    break
-                else:
-                    break
-
-        return cap_mask
+        return Bitboard(
+            self.size.value, self.capture_bits(position.bits, bits_p, bits_o)
+        )
 
     def pop(self):
         """
@@ -318,6 +451,7 @@ class OthelloBoard:
         popped = self.__history.pop()
         if popped[2] == -1 and popped[3] == -1:
             popped = self.__history.pop()
+        self.zobrist ^= self.__zobrist_delta(popped[0], popped[1])
         self.black = popped[0]
         self.white = popped[1]
         self.current_player = popped[4]
@@ -330,12 +464,23 @@ class OthelloBoard:
             logger.debug("Player %s passes their turn.", self.current_player)
             self.__history.append((self.black, self.white, -1, -1, self.current_player))
         else:
-            legal_moves = self.line_cap_move(self.current_player)
-            move_mask = Bitboard(self.size.value)
-            move_mask.set(x_coord, y_coord, True)
-            if (legal_moves & move_mask).bits > 0:
-                logger.debug("Move (%s, %s) is legal.", x_coord, y_coord)
-                capture_mask = self.line_cap(x_coord, y_coord, self.current_player)
+            white_to_move = self.current_player.index
+            bits_p = self.white.bits if white_to_move else self.black.bits
+            bits_o = self.black.bits if white_to_move else self.white.bits
+            size = self.size.value
+            # a raw bit rather than a Bitboard, play runs for every node of a search
+            move_bits = (
+                1 << (y_coord * size + x_coord)
+                if 0 <= x_coord < size and 0 <= y_coord < size
+                else 0
+            )
+            if self.legal_moves_bits(bits_p, bits_o) & move_bits:
+                # checked once for the three logging calls below, the players to log
+                # are not even computed when debug logging is off
+                debug = logger.isEnabledFor(logging.DEBUG)
+                if debug:
+                    logger.debug("Move (%s, %s) is legal.", x_coord, y_coord)
+                capture_bits = self.capture_bits(move_bits, bits_p, bits_o)
                 state_to_save = (
                     self.black,
                     self.white,
@@ -344,26 +489,24 @@ class OthelloBoard:
                     self.current_player,
                 )
                 self.__history.append(state_to_save)
-                logger.debug(
-                    "Move saved to history, history length: %s.", len(self.__history)
-                )
-                bits_p = (
-                    self.black if self.current_player is Color.BLACK else self.white
-                )
-                bits_o = (
-                    self.white if self.current_player is Color.BLACK else self.black
-                )
-                bits_p |= capture_mask
-                bits_o &= ~capture_mask
-                self.black = bits_p if self.current_player is Color.BLACK else bits_o
-                self.white = bits_o if self.current_player is Color.BLACK else bits_p
-                logger.debug(
-                    "Switching current player from %s to %s",
-                    self.current_player,
-                    ~self.current_player,
-                )
+                if debug:
+                    logger.debug(
+                        "Move saved to history, history length: %s.",
+                        len(self.__history),
+                    )
+                new_p = Bitboard(size, bits_p | capture_bits)
+                new_o = Bitboard(size, bits_o & ~capture_bits)
+                self.black = new_o if white_to_move else new_p
+                self.white = new_p if white_to_move else new_o
+                self.zobrist ^= self.__zobrist_delta(state_to_save[0], state_to_save[1])
+                if debug:
+                    logger.debug(
+                        "Switching current player from %s to %s",
+                        self.current_player,
+                        ~self.current_player,
+                    )
                 self.current_player = ~self.current_player
-                if not self.line_cap_move(self.current_player).bits:
+                if not self.legal_moves_bits(new_o.bits, new_p.bits):
                     logger.debug(
                         "Player %s has no legal moves and must pass.",
                         self.current_player,
@@ -399,7 +542,7 @@ class OthelloBoard:
         """
         if move[2] == -1 and move[3] == -1:
             return "-1-1"
-        return f"{chr(ord('a') + move[2])}{move[3] + 1}"
+        return SQUARE_NAMES[move[3]][move[2]]
 
     def export_board(self) -> str:
         """
@@ -467,6 +610,7 @@ class OthelloBoard:
         self.white = Bitboard(self.size.value)
         self.current_player = Color.BLACK
         self.__init_board()
+        self.zobrist = self.compute_zobrist()
         logger.debug("Game successfully restarted.")
 
     def __empty_mask(self) -> Bitboard:
@@ -485,7 +629,8 @@ class OthelloBoard:
         )
 
     def __hash__(self) -> int:
-        return hash((self.current_player, self.black, self.white))
+        # the incrementally maintained Zobrist hash already identifies the position
+        return self.position_hash()
 
     def __eq__(self, other) -> bool:
         if isinstance(other, OthelloBoard):
@@ -503,36 +648,32 @@ class OthelloBoard:
         """
         size_toggle_space = 10
         height_toggle_space = 9
+        # bound once, rather than looked up through self and Color on every square
+        size = self.size.value
+        black, white = self.black.bits, self.white.bits
+        black_symbol, white_symbol = Color.BLACK.value, Color.WHITE.value
+        possible_symbol, empty_symbol = Color.POSSIBLE.value, Color.EMPTY.value
         rez = "  "
-        if self.size.value >= size_toggle_space:
+        if size >= size_toggle_space:
             rez += " "
 
-        rez += " ".join(
-            [ascii_lowercase[letter_idx] for letter_idx in range(self.size.value)]
-        )
-        for y_coord in range(self.size.value):
-            rez += "\n"
-            for x_coord in range(self.size.value):
-                has_black = self.black.get(x_coord, y_coord)
-                has_white = self.white.get(x_coord, y_coord)
-                has_possible = self.line_cap_move(self.current_player).get(
-                    x_coord, y_coord
-                )
-                if not x_coord:
-                    rez += str(y_coord + 1) + " "
-                    if (
-                        self.size.value >= size_toggle_space
-                        and y_coord < height_toggle_space
-                    ):
-                        rez += " "
-                if has_black:
-                    rez += Color.BLACK.value
-                elif has_white:
-                    rez += Color.WHITE.value
-                elif has_possible:
-                    rez += Color.POSSIBLE.value
+        rez += " ".join([ascii_lowercase[letter_idx] for letter_idx in range(size)])
+        # legal moves do not change while rendering, compute them once for the whole grid
+        possible_moves = self.line_cap_move(self.current_player).bits
+        for y_coord in range(size):
+            rez += "\n" + str(y_coord + 1) + " "
+            if size >= size_toggle_space and y_coord < height_toggle_space:
+                rez += " "
+            cells = []
+            for bit_idx in range(y_coord * size, (y_coord + 1) * size):
+                bit = 1 << bit_idx
+                if black & bit:
+                    cells.append(black_symbol)
+                elif white & bit:
+                    cells.append(white_symbol)
+                elif possible_moves & bit:
+                    cells.append(possible_symbol)
                 else:
-                    rez += Color.EMPTY.value
-                if x_coord < self.size.value - 1:
-                    rez += " "
+                    cells.append(empty_symbol)
+            rez += " ".join(cells)
         return rez
@@ -56,6 +56,7 @@ VALID_AIMODES = [x.value for x in AIMode]
 VALID_AIHEURISTICS = [x.value for x in AIHeuristic]
 DEFAULT_AI_DEPTH = 3
 DEFAULT_AI_TIME = 5
+DEFAULT_AI_WORKERS = 1
 DEFAULT_AI_HEURISTIC = "corners_captured"
 DEFAULT_GUI = False
 
@@ -72,6 +73,7 @@ default_config = {
     "ai_depth": 3,
     "ai_heuristic": "corners_captured",
     "ai_time": 5,
+    "ai_workers": DEFAULT_AI_WORKERS,
     "gui": DEFAULT_GUI,
     "benchmark": False,
     "white_ai_mode": "minimax",
@@ -221,6 +223,15 @@ default is '{DEFAULT_AI_HEURISTIC}'",
         help=f"Set AI time limit (in seconds), default is {DEFAULT_AI_TIME} seconds",
     )
 
+    parser.add_argument(
+        "--ai-workers",
+        type=int,
+        default=DEFAULT_AI_WORKERS,
+        metavar="WORKERS",
+        help=f"Set the number of processes the AI searches with, default is \
+{DEFAULT_AI_WORKERS} (no parallelism)",
+    )
+
     parser.add_argument(
         "-g",
         "--gui",
@@ -315,6 +326,10 @@ when loading a game from a file",
     if args.ai_time <= 0:
         parse_error(parser, "AI time limit must be positive")
 
+    # specifying a non positive number of ai workers raises an error
+    if args.ai_workers <= 0:
+        parse_error(parser, "AI workers must be positive")
+
     # build configuration dictionary
     config = {
         "mode": mode,
@@ -328,6 +343,7 @@ when loading a game from a file",
         "ai_depth": DEFAULT_AI_DEPTH,
         "ai_heuristic": DEFAULT_AI_HEURISTIC,
         "ai_time": DEFAULT_AI_TIME,
+        "ai_workers": args.ai_workers,
         "gui": args.gui,
         "benchmark": args.benchmark,
         "white_ai_mode": args.white_ai_mode,
@@ -1,4 +1,6 @@
+import logging
 import pytest
+from unittest.mock import MagicMock, patch
 from copy import deepcopy
 
 from othello.othello_board import OthelloBoard, BoardSize, Color
@@ -10,7 +12,16 @@ from othello.ai_features import (
     minimax,
     alphabeta,
     mobility_heuristic,
+    move_ordering_masks,
+    ordered_moves,
     random_move,
+    root_search_pool,
+    shutdown_root_search_pool,
+    TranspositionTable,
+    TT_EXACT,
+    TT_LOWER,
+    TT_UPPER,
+    TT_VALUE_MAX,
 )
 
 # region Fixtures
@@ -199,6 +210,14 @@ def test_mobility_start_pos(board_start_pos):
     assert mobility_heuristic(board_start_pos, Color.WHITE) == 0
 
 
+def test_mobility_counts_each_player_moves(board_start_pos):
+    board_start_pos.play(2, 1)
+    board_start_pos.play(1, 1)
+    # black has 4 moves, white has 5
+    assert mobility_heuristic(board_start_pos, Color.BLACK) == -11
+    assert mobility_heuristic(board_start_pos, Color.WHITE) == 11
+
+
 def test_mobility_no_move(board_6_empty):
     assert mobility_heuristic(board_6_empty, Color.BLACK) == 0
     assert mobility_heuristic(board_6_empty, Color.WHITE) == 0
@@ -343,6 +362,165 @@ def test_best_moves_corners_and_parity(board_6_test_best_moves):
     ) == (0, 3)
 
 
+@pytest.mark.parametrize(
+    "heuristic", ["corners_captured", "coin_parity", "mobility", "all_in_one"]
+)
+def test_alphabeta_matches_minimax(board_start_pos, board_6_test_best_moves, heuristic):
+    """Tests that pruning (root window included) never changes the chosen move."""
+    for board, color in (
+        (board_start_pos, Color.BLACK),
+        (board_6_test_best_moves, Color.WHITE),
+    ):
+        for depth in (2, 3):
+            assert find_best_move(
+                board, depth, color, "alphabeta", heuristic
+            ) == find_best_move(board, depth, color, "minimax", heuristic)
+
+
+def test_find_best_move_reuses_transposition_table(board_start_pos):
+    transposition_table = TranspositionTable()
+    expected = find_best_move(board_start_pos, 3, Color.BLACK, "alphabeta", "mobility")
+    assert (
+        find_best_move(
+            board_start_pos,
+            3,
+            Color.BLACK,
+            "alphabeta",
+            "mobility",
+            transposition_table=transposition_table,
+        )
+        == expected
+    )
+    assert len(transposition_table)
+    transposition_table.new_search()
+    assert (
+        find_best_move(
+            board_start_pos,
+            3,
+            Color.BLACK,
+            "alphabeta",
+            "mobility",
+            transposition_table=transposition_table,
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize("heuristic", ["coin_parity", "mobility"])
+def test_find_best_move_parallel_matches_serial(board_start_pos, heuristic):
+    """Tests that searching the younger root moves in other processes changes nothing."""
+    board_start_pos.play(2, 1)
+    board_start_pos.play(1, 1)
+    assert find_best_move(
+        board_start_pos, 3, Color.BLACK, "alphabeta", heuristic, workers=2
+    ) == find_best_move(board_start_pos, 3, Color.BLACK, "alphabeta", heuristic)
+
+
+def test_find_best_move_parallel_does_not_send_the_callers_board(board_start_pos):
+    board_start_pos.play(2, 1)
+    board_start_pos.play(1, 1)
+    with patch("othello.ai_features.root_search_pool") as mock_pool:
+        mock_pool.return_value.submit.return_value.result.return_value = float("-inf")
+        find_best_move(board_start_pos, 3, Color.BLACK, "alphabeta", workers=2)
+    assert mock_pool.return_value.submit.call_args_list
+    for submit_call in mock_pool.return_value.submit.call_args_list:
+        sent_board = submit_call.args[1]
+        assert sent_board is not board_start_pos
+        assert sent_board == board_start_pos
+
+
+def test_root_search_pool_replaced_when_workers_change():
+    with patch("othello.ai_features.ProcessPoolExecutor") as mock_executor:
+        mock_executor.side_effect = lambda **kwargs: MagicMock()
+        shutdown_root_search_pool()
+        first = root_search_pool(2)
+        assert root_search_pool(2) is first
+        second = root_search_pool(3)
+        assert second is not first
+        first.shutdown.assert_called_once()
+        shutdown_root_search_pool()
+        second.shutdown.assert_called_once()
+        assert root_search_pool(3) is not second
+        shutdown_root_search_pool()
+
+
+def test_find_best_move_forced_move(board_start_pos):
+    for move in ((2, 1), (1, 1), (0, 1), (0, 0), (4, 3), (0, 2)):
+        board_start_pos.play(*move)
+    with patch("othello.ai_features.alphabeta") as mock_alphabeta:
+        assert find_best_move(board_start_pos, 3, Color.BLACK) == (1, 2)
+        mock_alphabeta.assert_not_called()
+
+
+def test_find_best_move_benchmark_reports_time(board_start_pos, capsys):
+    assert find_best_move(board_start_pos, 2, Color.BLACK, benchmark=True) != (-1, -1)
+    assert "Time taken:" in capsys.readouterr().out
+    # forced moves report their time too
+    for move in ((2, 1), (1, 1), (0, 1), (0, 0), (4, 3), (0, 2)):
+        board_start_pos.play(*move)
+    assert find_best_move(board_start_pos, 3, Color.BLACK, benchmark=True) == (1, 2)
+    assert "Time taken:" in capsys.readouterr().out
+
+
+def test_search_logs_only_when_debug_enabled(board_start_pos, caplog):
+    with caplog.at_level(logging.INFO, logger="Othello"):
+        alphabeta(
+            board_start_pos, 1, float("-inf"), float("inf"), Color.BLACK, lambda *_: 0
+        )
+    assert not caplog.records
+    with caplog.at_level(logging.DEBUG, logger="Othello"):
+        alphabeta(
+            board_start_pos, 1, float("-inf"), float("inf"), Color.BLACK, lambda *_: 0
+        )
+    assert "Starting alphabeta evaluation" in caplog.text
+
+
+def test_find_best_move_copies_board_once(board_start_pos):
+    with patch("othello.ai_features.deepcopy", wraps=deepcopy) as mock_deepcopy:
+        find_best_move(board_start_pos, 2, Color.BLACK, "alphabeta", "coin_parity")
+        mock_deepcopy.assert_called_once_with(board_start_pos)
+    assert board_start_pos.get_history() == []
+
+
+def test_transposition_table_replacement():
+    # two buckets, all the odd keys share the second one
+    transposition_table = TranspositionTable(tt_bits=1)
+    transposition_table.store(1, 3, TT_EXACT, 10, (0, 0))
+    transposition_table.store(3, 2, TT_LOWER, 5, (1, 1))
+    assert transposition_table.get(1)[:4] == (3, TT_EXACT, 10, (0, 0))
+    assert transposition_table.get(3)[:4] == (2, TT_LOWER, 5, (1, 1))
+    assert transposition_table.get(2) is None
+    # shallower: the always-replace slot is overwritten
+    transposition_table.store(5, 1, TT_EXACT, 0, None)
+    assert transposition_table.get(3) is None
+    assert transposition_table.get(1) is not None
+    # deeper: the depth-preferred slot is overwritten
+    transposition_table.store(7, 4, TT_EXACT, 0, None)
+    assert transposition_table.get(1) is None
+    assert len(transposition_table) == 2
+    # entries of previous searches are replaced whatever their depth
+    transposition_table.new_search()
+    transposition_table.store(9, 0, TT_EXACT, 0, None)
+    assert transposition_table.get(7) is None
+    assert transposition_table.get(9)[4] == transposition_table.generation
+
+
+def test_transposition_table_packing():
+    transposition_table = TranspositionTable(tt_bits=4)
+    transposition_table.store(0xFFFFFFFFFFFFFFFF, 12, TT_UPPER, -1500, (11, 11))
+    assert transposition_table.get(0xFFFFFFFFFFFFFFFF) == (
+        12,
+        TT_UPPER,
+        -1500,
+        (11, 11),
+        0,
+    )
+    assert transposition_table.get(0) is None
+    # values out of the packed range are clamped
+    transposition_table.store(2, 0, TT_LOWER, float("inf"), None)
+    assert transposition_table.get(2)[2] == TT_VALUE_MAX
+
+
 def test_game_over_best_move(board_6_game_over):
     assert find_best_move(
         board_6_game_over, 1, Color.BLACK, "minimax", "corners_captured"
@@ -351,6 +529,76 @@ def test_game_over_best_move(board_6_game_over):
 
 # endregion Find Best Move
 
+# region Move Ordering
+
+
+def test_move_ordering_masks_eight():
+    corners, edges, interior, x_squares = move_ordering_masks(8)
+    assert corners == 0x8100000000000081
+    assert x_squares == 0x0042000000004200
+    assert edges == 0xFF818181818181FF & ~corners
+    assert corners | edges | interior | x_squares == (1 << 64) - 1
+    assert not interior & (corners | edges | x_squares)
+
+
+def test_ordered_moves():
+    moves = 0
+    for x_coord, y_coord in ((1, 1), (3, 3), (0, 4), (5, 5), (0, 0)):
+        moves |= 1 << (y_coord * 6 + x_coord)
+    assert ordered_moves(moves, 6) == [(0, 0), (5, 5), (0, 4), (3, 3), (1, 1)]
+
+
+def test_alphabeta_tries_hash_move_first(board_start_pos):
+    moves = ordered_moves(
+        board_start_pos.line_cap_move(Color.BLACK).bits, board_start_pos.size.value
+    )
+    table = TranspositionTable()
+    table.store(board_start_pos.position_hash(), 0, TT_EXACT, 0, moves[-1])
+    visited = []
+
+    def recording_heuristic(board, _max_player):
+        visited.append(board.get_last_play()[2:4])
+        return 0
+
+    alphabeta(
+        board_start_pos,
+        1,
+        float("-inf"),
+        float("inf"),
+        Color.BLACK,
+        recording_heuristic,
+        table,
+    )
+    assert visited[0] == moves[-1]
+    assert sorted(visited) == sorted(moves)
+
+
+def test_find_best_move_tries_hash_move_first(board_start_pos):
+    moves = ordered_moves(
+        board_start_pos.line_cap_move(Color.BLACK).bits, board_start_pos.size.value
+    )
+    table = TranspositionTable()
+    table.store(board_start_pos.position_hash(), 1, TT_EXACT, 0, moves[-1])
+    visited = []
+
+    def recording_heuristic(board, _max_player):
+        visited.append(board.get_last_play()[2:4])
+        return 0
+
+    find_best_move(
+        board_start_pos,
+        1,
+        Color.BLACK,
+        "alphabeta",
+        recording_heuristic,
+        transposition_table=table,
+        pv_hint=(-1, -1),
+    )
+    assert visited[0] == moves[-1]
+
+
+# endregion Move Ordering
+
 # region Random Move
 
 
@@ -365,3 +365,21 @@ def test_hot_bits_coordinates():
     b = Bitboard(6, bits=0b000010100001001000000000000010100001)
     must_be_positions = [(0, 0), (5, 0), (1, 1), (3, 3), (0, 4), (5, 4), (1, 5)]
     assert b.hot_bits_coordinates() == must_be_positions
+    b = Bitboard(12, bits=(1 << 143) | (1 << 12) | 1)
+    assert b.hot_bits_coordinates() == [(0, 0), (0, 1), (11, 11)]
+
+
+def test_random_hot_bit():
+    b = Bitboard(6, bits=0b000010100001001000000000000010100001)
+    positions = b.hot_bits_coordinates()
+    rng = random.Random(42)
+    picked = {b.random_hot_bit(rng) for _ in range(200)}
+    assert picked == set(positions)
+    with pytest.raises(ValueError):
+        Bitboard(6).random_hot_bit()
+
+
+def test_random_hot_bit_index():
+    b = Bitboard(6, bits=0b100010000001)
+    rng = random.Random(7)
+    assert {b.random_hot_bit_index(rng) for _ in range(100)} == {0, 7, 11}
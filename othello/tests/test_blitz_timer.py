@@ -1,6 +1,7 @@
 import pytest
 from time import time, sleep
 import unittest
+from unittest.mock import patch
 
 import othello
 from othello.blitz_timer import BlitzTimer
@@ -162,3 +163,17 @@ def test_display_time():
         == """Black Time: 00:05
 White Time: 00:06"""
     )
+
+
+def test_remaining_time_reads_clock_once():
+    """
+    Tests that updating the running player's time reads the clock once, so
+    the elapsed time is charged exactly and the next interval starts at the
+    same instant.
+    """
+    timer = BlitzTimer(TEST_TIME)
+    with patch("othello.blitz_timer.time", side_effect=[100.0, 102.0, 103.0]) as clock:
+        timer.start_timer(PLAYER1)
+        assert timer.get_remaining_time(PLAYER1) == TEST_TIME * 60 - 2
+        assert timer.get_remaining_time(PLAYER1) == TEST_TIME * 60 - 3
+    assert clock.call_count == 3
@@ -5,6 +5,7 @@ from othello.command_parser import (
     CommandParser,
     CommandParserException,
     PlayCommand,
+    get_command_parser,
 )
 
 
@@ -46,6 +47,17 @@ def test_legal_plays():
     assert cp.parse_str("h8") == (CommandKind.PLAY_MOVE, PlayCommand(7, 7))
 
 
+def test_legal_plays_large_boards():
+    cp = CommandParser(10)
+    assert cp.parse_str("c5") == (CommandKind.PLAY_MOVE, PlayCommand(2, 4))
+    assert cp.parse_str("j10") == (CommandKind.PLAY_MOVE, PlayCommand(9, 9))
+    cp = CommandParser(12)
+    assert cp.parse_str("l12") == (CommandKind.PLAY_MOVE, PlayCommand(11, 11))
+    for bad_str in ("a0", "a13", "m1", "a01"):
+        with pytest.raises(CommandParserException):
+            cp.parse_str(bad_str)
+
+
 def test_illegal_plays():
     cp = CommandParser(6)
     with pytest.raises(CommandParserException):
@@ -106,3 +118,12 @@ def test_print_rules(capsys, monkeypatch):
         in captured.out
     )
     assert "Press Enter to continue playing..." in captured.out
+
+
+def test_get_command_parser_is_shared_per_size():
+    assert get_command_parser(8) is get_command_parser(8)
+    assert get_command_parser(6) is not get_command_parser(8)
+    assert get_command_parser(6).parse_str("f6") == (
+        CommandKind.PLAY_MOVE,
+        PlayCommand(5, 5),
+    )
@@ -53,6 +53,30 @@ def test_save_and_load_config(temp_config_file):
     assert loaded_config == sample_config
 
 
+def test_save_config_replaces_existing_file(temp_config_file):
+    prefix = temp_config_file.replace(".othellorc", "")
+    save_config({"mode": "normal", "size": "8"}, filename_prefix=prefix)
+    save_config({"mode": "blitz"}, filename_prefix=prefix)
+
+    assert load_config(filename_prefix=prefix) == {"mode": "blitz"}
+    assert not os.path.exists(temp_config_file + ".tmp")
+
+
+def test_save_config_formats_values(temp_config_file):
+    prefix = temp_config_file.replace(".othellorc", "")
+    save_config(
+        {"debug": True, "gui": False, "size": 8, "filename": None},
+        filename_prefix=prefix,
+    )
+
+    assert load_config(filename_prefix=prefix) == {
+        "debug": "true",
+        "gui": "false",
+        "size": "8",
+        "filename": "None",
+    }
+
+
 def test_load_nonexistent_config():
     with pytest.raises(FileNotFoundError):
         load_config(filename_prefix="nonexistent")
@@ -152,9 +176,12 @@ def test_save_board_state_with_prefix_and_history_only(tmp_path):
     controller.export.assert_not_called()
 
 
+@patch("othello.config.os.replace")
 @patch("builtins.input", side_effect=["invalid/name", "validname"])
 @patch("builtins.open", new_callable=mock_open)
-def test_save_board_state_prompts_for_valid_filename(mock_open_func, mock_input):
+def test_save_board_state_prompts_for_valid_filename(
+    mock_open_func, mock_input, mock_replace
+):
     controller = MagicMock()
     controller.export.return_value = "DATA"
 
@@ -170,6 +197,7 @@ def test_save_board_state_prompts_for_valid_filename(mock_open_func, mock_input)
 
     assert mock_input.call_count == 2
     controller.export.assert_called_once()
+    mock_replace.assert_called_once_with("validname.sav.tmp", "validname.sav")
 
 
 @patch("builtins.open", new_callable=mock_open)
@@ -1,4 +1,9 @@
+from concurrent.futures import Future
+import logging
+import queue
+import threading
 import pytest
+from othello.ai_features import coin_parity_heuristic
 from othello.bitboard import Bitboard
 from othello.controllers import (
     AIPlayer,
@@ -40,6 +45,11 @@ def test_human_next_move():
     controller_mock.human_play_callback.assert_called_once()
 
 
+def test_player_is_abstract():
+    with pytest.raises(TypeError):
+        Player()
+
+
 def test_random_player_next_move():
     p = RandomPlayer()
     assert p.controller is None
@@ -47,14 +57,14 @@ def test_random_player_next_move():
     controller_mock = MagicMock()
     p.attach(controller_mock)
     p.set_color(Color.BLACK)
-    possible_moves_mock = MagicMock()
-    possible_moves_mock.hot_bits_coordinates.return_value = [(3, 4), (5, 6)]
-    controller_mock.get_possible_moves.return_value = possible_moves_mock
+    controller_mock.get_possible_moves.return_value = Bitboard(
+        8, bits=(1 << (4 * 8 + 3)) | (1 << (6 * 8 + 5))
+    )
     p.next_move()
     controller_mock.get_possible_moves.assert_called_once_with(Color.BLACK)
-    controller_mock.play.assert_called_once()
-    play_args = controller_mock.play.call_args[0]
-    assert play_args in [(3, 4), (5, 6)]
+    controller_mock.play_idx.assert_called_once()
+    play_args = controller_mock.play_idx.call_args[0]
+    assert play_args in [(4 * 8 + 3,), (6 * 8 + 5,)]
     p.next_move()
 
 
@@ -68,13 +78,19 @@ def test_ai_player_next_move():
     assert p.algorithm == "minimax"
     assert p.heuristic == "coin_parity"
     controller_mock = MagicMock()
+    controller_mock.ui_dispatch_callback = None
     p.attach(controller_mock)
     p.set_color(Color.BLACK)
     with patch("othello.controllers.find_best_move") as mock_find_best_move:
         mock_find_best_move.return_value = (4, 5)
         p.next_move()
         mock_find_best_move.assert_called_once_with(
-            board_mock, 3, Color.BLACK, "minimax", "coin_parity"
+            board_mock,
+            3,
+            Color.BLACK,
+            "minimax",
+            coin_parity_heuristic,
+            transposition_table=p.transposition_table,
         )
         controller_mock.play.assert_called_once_with(4, 5)
     p = AIPlayer(board=board_mock, depth=5, algorithm="alphabeta", heuristic="mobility")
@@ -82,6 +98,211 @@ def test_ai_player_next_move():
     p.set_color(Color.WHITE)
 
 
+def test_ai_player_iterative_deepening():
+    board_mock = MagicMock(spec=OthelloBoard)
+    board_mock.size = BoardSize.EIGHT_BY_EIGHT
+    board_mock.current_player = Color.WHITE
+    board_mock.line_cap_move.return_value = Bitboard(8, 1 << 12 | 1 << 45)
+    p = AIPlayer(board=board_mock, depth=3, algorithm="alphabeta", heuristic="mobility")
+    controller_mock = MagicMock()
+    controller_mock.ui_dispatch_callback = None
+    controller_mock.is_blitz.return_value = False
+    p.attach(controller_mock)
+    p.set_color(Color.WHITE)
+    with patch("othello.controllers.find_best_move") as mock_find_best_move:
+        mock_find_best_move.side_effect = [(1, 2), (4, 5), (4, 5)]
+        p.next_move()
+        assert [c.args[1] for c in mock_find_best_move.call_args_list] == [1, 2, 3]
+        assert [c.kwargs["pv_hint"] for c in mock_find_best_move.call_args_list] == [
+            (-1, -1),
+            (1, 2),
+            (4, 5),
+        ]
+        # the root moves are listed once for all the depths
+        board_mock.line_cap_move.assert_called_once_with(Color.WHITE)
+        assert [c.kwargs["root_moves"] for c in mock_find_best_move.call_args_list] == [
+            [(4, 1), (5, 5)]
+        ] * 3
+        controller_mock.play.assert_called_once_with(4, 5)
+
+
+def test_ai_player_iterative_deepening_blitz_budget():
+    board_mock = MagicMock(spec=OthelloBoard)
+    board_mock.size = BoardSize.EIGHT_BY_EIGHT
+    board_mock.current_player = Color.BLACK
+    board_mock.line_cap_move.return_value = Bitboard(8)
+    board_mock.black = MagicMock()
+    board_mock.black.popcount.return_value = 2
+    board_mock.white = MagicMock()
+    board_mock.white.popcount.return_value = 2
+    p = AIPlayer(board=board_mock, depth=4, algorithm="alphabeta", heuristic="mobility")
+    controller_mock = MagicMock()
+    controller_mock.ui_dispatch_callback = None
+    controller_mock.is_blitz.return_value = True
+    controller_mock.blitz.get_remaining_time.return_value = 0
+    p.attach(controller_mock)
+    p.set_color(Color.BLACK)
+    with patch("othello.controllers.find_best_move") as mock_find_best_move:
+        mock_find_best_move.return_value = (2, 3)
+        p.next_move()
+        mock_find_best_move.assert_called_once()
+        controller_mock.blitz.get_remaining_time.assert_called_once_with("black")
+        controller_mock.play.assert_called_once_with(2, 3)
+
+
+def test_ai_player_iterative_deepening_skips_unaffordable_depth():
+    board_mock = MagicMock(spec=OthelloBoard)
+    board_mock.size = BoardSize.SIX_BY_SIX
+    board_mock.current_player = Color.BLACK
+    board_mock.line_cap_move.return_value = Bitboard(6)
+    board_mock.black = MagicMock()
+    board_mock.black.popcount.return_value = 2
+    board_mock.white = MagicMock()
+    board_mock.white.popcount.return_value = 2
+    p = AIPlayer(board=board_mock, depth=4, algorithm="alphabeta", heuristic="mobility")
+    controller_mock = MagicMock()
+    controller_mock.ui_dispatch_callback = None
+    controller_mock.is_blitz.return_value = True
+    # 16 moves left to play, one second each
+    controller_mock.blitz.get_remaining_time.return_value = 16
+    p.attach(controller_mock)
+    p.set_color(Color.BLACK)
+    with patch("othello.controllers.find_best_move") as mock_find_best_move, patch(
+        "othello.controllers.time.time", side_effect=[0, 0.1, 0.6]
+    ):
+        mock_find_best_move.side_effect = [(1, 2), (4, 5)]
+        p.next_move()
+        assert mock_find_best_move.call_count == 2
+        controller_mock.play.assert_called_once_with(4, 5)
+
+
+def test_ai_player_next_move_in_background():
+    board_mock = MagicMock(spec=OthelloBoard)
+    board_mock.position_hash.return_value = 42
+    p = AIPlayer(board=board_mock, depth=2, algorithm="minimax", heuristic="mobility")
+    controller_mock = MagicMock()
+    dispatched = queue.Queue()
+    controller_mock.ui_dispatch_callback = lambda *args: dispatched.put(args)
+    p.attach(controller_mock)
+    p.set_color(Color.BLACK)
+    with patch("othello.controllers.find_best_move") as mock_find_best_move:
+        mock_find_best_move.return_value = (2, 3)
+        p.next_move()
+        callback, *args = dispatched.get(timeout=5)
+    controller_mock.play.assert_not_called()
+    callback(*args)
+    controller_mock.play.assert_called_once_with(2, 3)
+    # the position changed while searching: the move is dropped
+    board_mock.position_hash.return_value = 7
+    callback(*args)
+    controller_mock.play.assert_called_once_with(2, 3)
+
+
+def test_ai_player_next_move_in_background_searches_once():
+    board_mock = MagicMock(spec=OthelloBoard)
+    board_mock.position_hash.return_value = 42
+    p = AIPlayer(board=board_mock, depth=2, algorithm="minimax", heuristic="mobility")
+    controller_mock = MagicMock()
+    dispatched = queue.Queue()
+    controller_mock.ui_dispatch_callback = lambda *args: dispatched.put(args)
+    p.attach(controller_mock)
+    p.set_color(Color.BLACK)
+    with patch("othello.controllers.find_best_move") as mock_find_best_move:
+        mock_find_best_move.return_value = (2, 3)
+        p.next_move()
+        p.next_move()
+        callback, *args = dispatched.get(timeout=5)
+        assert dispatched.empty()
+        mock_find_best_move.assert_called_once()
+        callback(*args)
+        controller_mock.play.assert_called_once_with(2, 3)
+        # once played, the same position may be searched again (e.g. after a restart)
+        p.next_move()
+        dispatched.get(timeout=5)
+        assert mock_find_best_move.call_count == 2
+
+
+def test_ai_player_background_search_failure_is_dispatched(caplog):
+    board_mock = MagicMock(spec=OthelloBoard)
+    board_mock.position_hash.return_value = 42
+    p = AIPlayer(board=board_mock, depth=2, algorithm="minimax", heuristic="mobility")
+    controller_mock = MagicMock()
+    dispatched = queue.Queue()
+    controller_mock.ui_dispatch_callback = lambda *args: dispatched.put(args)
+    p.attach(controller_mock)
+    p.set_color(Color.BLACK)
+    with patch("othello.controllers.find_best_move") as mock_find_best_move:
+        mock_find_best_move.side_effect = RuntimeError("search failed")
+        p.next_move()
+        callback, *args = dispatched.get(timeout=5)
+        with caplog.at_level(logging.ERROR, logger="Othello"):
+            callback(*args)
+        assert "AI search of position 2a failed." in caplog.text
+        controller_mock.play.assert_not_called()
+        # the failed search does not block the position
+        mock_find_best_move.side_effect = None
+        mock_find_best_move.return_value = (2, 3)
+        p.next_move()
+        callback, *args = dispatched.get(timeout=5)
+        callback(*args)
+        controller_mock.play.assert_called_once_with(2, 3)
+
+
+def test_ai_player_cancelled_search_and_restart_clear_the_guard():
+    board_mock = MagicMock(spec=OthelloBoard)
+    board_mock.position_hash.return_value = 42
+    p = AIPlayer(board=board_mock, depth=2, algorithm="minimax", heuristic="mobility")
+    dispatched = queue.Queue()
+    dispatch = lambda *args: dispatched.put(args)
+    cancelled = Future()
+    cancelled.cancel()
+    p._searching = 42
+    p._search_done(dispatch, 42, cancelled)
+    callback, *args = dispatched.get(timeout=5)
+    callback(*args)
+    assert p._searching is None
+    p._searching = 42
+    p.restart()
+    assert p._searching is None
+
+
+def test_ai_player_searches_a_snapshot_of_the_board():
+    board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    p = AIPlayer(board=board, depth=2, algorithm="minimax", heuristic="mobility")
+    controller_mock = MagicMock()
+    dispatched = queue.Queue()
+    controller_mock.ui_dispatch_callback = lambda *args: dispatched.put(args)
+    p.attach(controller_mock)
+    p.set_color(Color.BLACK)
+    with patch("othello.controllers.find_best_move") as mock_find_best_move:
+        mock_find_best_move.return_value = (2, 3)
+        p.next_move()
+        dispatched.get(timeout=5)
+    searched_board = mock_find_best_move.call_args.args[0]
+    assert searched_board is not board
+    assert searched_board == board
+
+
+def test_ai_player_reads_the_blitz_timer_before_searching_in_background():
+    board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    p = AIPlayer(board=board, depth=2, algorithm="alphabeta", heuristic="mobility")
+    controller_mock = MagicMock()
+    dispatched = queue.Queue()
+    controller_mock.ui_dispatch_callback = lambda *args: dispatched.put(args)
+    controller_mock.is_blitz.return_value = True
+    timer_threads = []
+    controller_mock.blitz.get_remaining_time.side_effect = (
+        lambda player: timer_threads.append(threading.get_ident()) or 60
+    )
+    p.attach(controller_mock)
+    p.set_color(Color.BLACK)
+    with patch("othello.controllers.find_best_move") as mock_find_best_move:
+        mock_find_best_move.return_value = (2, 3)
+        p.next_move()
+        dispatched.get(timeout=5)
+    assert timer_threads == [threading.get_ident()]
+
+
 def test_game_controller_init():
     board_mock = MagicMock(spec=OthelloBoard)
     board_mock.size = BoardSize.EIGHT_BY_EIGHT
@@ -91,15 +312,14 @@ def test_game_controller_init():
     assert controller._board == board_mock
     assert controller.size == board_mock.size
     assert controller.first_player_human
-    assert controller.post_play_callback is None
+    controller.post_play_callback()  # a no-op by default
     assert not controller.is_blitz()
     assert controller.human_play_callback is None
     black_player_mock.attach.assert_called_once_with(controller)
     black_player_mock.set_color.assert_called_once_with(Color.BLACK)
     white_player_mock.attach.assert_called_once_with(controller)
     white_player_mock.set_color.assert_called_once_with(Color.WHITE)
-    assert controller.players[Color.BLACK] == black_player_mock
-    assert controller.players[Color.WHITE] == white_player_mock
+    assert controller.players == [black_player_mock, white_player_mock]
 
 
 def test_game_controller_init_with_blitz():
@@ -134,6 +354,7 @@ def test_get_possible_moves():
     black_player_mock = MagicMock()
     white_player_mock = MagicMock()
     expected_moves = MagicMock()
+    board_mock.zobrist = 0
     board_mock.line_cap_move.return_value = expected_moves
     controller = GameController(board_mock, black_player_mock, white_player_mock)
     result = controller.get_possible_moves(Color.BLACK)
@@ -141,6 +362,61 @@ def test_get_possible_moves():
     assert result == expected_moves
 
 
+def test_get_possible_moves_cached():
+    board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    controller = GameController(board, MagicMock(), MagicMock())
+    first = controller.get_possible_moves(Color.BLACK)
+    assert controller.get_possible_moves(Color.BLACK) is first
+    assert first == board.line_cap_move(Color.BLACK)
+    assert controller.get_possible_moves(Color.WHITE) == board.line_cap_move(
+        Color.WHITE
+    )
+    board.play(3, 2)
+    assert controller.get_possible_moves(Color.WHITE) == board.line_cap_move(
+        Color.WHITE
+    )
+    board.pop()
+    assert controller.get_possible_moves(Color.BLACK) is first
+
+
+def test_get_possible_moves_computed_once_per_position():
+    board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    controller = GameController(board, MagicMock(), MagicMock())
+    with patch.object(
+        OthelloBoard, "line_cap_move", wraps=board.line_cap_move
+    ) as line_cap_move:
+        for _ in range(3):
+            controller.get_possible_moves(Color.BLACK)
+            controller.get_possible_moves_raw(Color.BLACK)
+        assert line_cap_move.call_count == 1
+
+
+def test_get_possible_moves_raw():
+    board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    controller = GameController(board, MagicMock(), MagicMock())
+    assert (
+        controller.get_possible_moves_raw(Color.WHITE)
+        == board.line_cap_move(Color.WHITE).bits
+    )
+
+
+def test_play_keeps_position_hash():
+    board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    controller = GameController(board, MagicMock(), MagicMock())
+    for move in ((3, 2), (2, 2), (2, 3)):
+        controller.play(*move)
+        assert board.zobrist == board.compute_zobrist()
+    controller.restart()
+    assert board.zobrist == board.compute_zobrist()
+
+
+def test_play_idx():
+    board = OthelloBoard(BoardSize.SIX_BY_SIX)
+    controller = GameController(board, MagicMock(), MagicMock())
+    controller.play_idx(1 * 6 + 2)
+    assert board.get_last_play()[2:4] == (2, 1)
+
+
 def test_get_last_play():
     board_mock = MagicMock(spec=OthelloBoard)
     board_mock.size = BoardSize.EIGHT_BY_EIGHT
@@ -194,6 +470,15 @@ def test_get_position():
     assert not white_pos
 
 
+def test_get_pieces_follows_board():
+    board = OthelloBoard(BoardSize.SIX_BY_SIX)
+    controller = GameController(board, MagicMock(), MagicMock())
+    board.play(2, 1)
+    assert controller.get_pieces(Color.BLACK) is board.black
+    assert controller.get_pieces(Color.WHITE) is board.white
+    assert sorted(controller.get_pieces(Color.WHITE).hot_bits_coordinates()) == [(3, 3)]
+
+
 def test_restart():
     board_mock = MagicMock(spec=OthelloBoard)
     board_mock.size = BoardSize.EIGHT_BY_EIGHT
@@ -202,6 +487,8 @@ def test_restart():
     controller = GameController(board_mock, black_player_mock, white_player_mock)
     controller.restart()
     board_mock.restart.assert_called_once()
+    black_player_mock.restart.assert_called_once()
+    white_player_mock.restart.assert_called_once()
 
 
 def test_get_turn_number():
@@ -230,17 +517,11 @@ def test_get_current_player():
 def test_current_player_is_human():
     board_mock = MagicMock(spec=OthelloBoard)
     board_mock.size = BoardSize.EIGHT_BY_EIGHT
-    human_player = MagicMock()
-    ai_player = MagicMock()
     board_mock.current_player = Color.BLACK
-    controller = GameController(board_mock, human_player, ai_player)
-    with patch("othello.controllers.isinstance", return_value=True):
-        result = controller.current_player_is_human()
-        assert result
+    controller = GameController(board_mock, HumanPlayer(), RandomPlayer())
+    assert controller.current_player_is_human()
     board_mock.current_player = Color.WHITE
-    with patch("othello.controllers.isinstance", return_value=False):
-        result = controller.current_player_is_human()
-        assert not result
+    assert not controller.current_player_is_human()
 
 
 def test_get_pieces_count():
@@ -263,6 +544,18 @@ def test_get_pieces_count():
     assert white_count == 12
 
 
+def test_get_both_counts():
+    board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    controller = GameController(board, MagicMock(), MagicMock())
+    assert controller.get_both_counts() == (2, 2)
+    board.play(3, 2)
+    assert controller.get_both_counts() == (
+        controller.get_pieces_count(Color.BLACK),
+        controller.get_pieces_count(Color.WHITE),
+    )
+    assert controller.get_both_counts() == (4, 1)
+
+
 def test_get_history():
     board_mock = MagicMock(spec=OthelloBoard)
     board_mock.size = BoardSize.EIGHT_BY_EIGHT
@@ -109,6 +109,20 @@ def test_get_player_move(normal_game, capsys):
     assert result == (4, 3)
 
 
+def test_get_player_move_two_digit_row(normal_game):
+    """Test that rows past 9 are parsed as a whole number."""
+    with patch("builtins.input", return_value=" B10 "):
+        assert OthelloCLI.get_player_move() == (1, 9)
+
+
+def test_get_player_move_malformed(normal_game):
+    """Test that malformed input is rejected with a ValueError."""
+    for bad_input in ("", "e", "4e", "e4x"):
+        with patch("builtins.input", return_value=bad_input):
+            with pytest.raises(ValueError):
+                OthelloCLI.get_player_move()
+
+
 def test_process_valid_move(normal_game):
     """Test that valid moves are processed correctly."""
     possible_moves = MagicMock()
@@ -135,15 +149,21 @@ def test_process_invalid_move(normal_game, capsys):
 
 def test_display_possible_moves(normal_game, capsys):
     """Test that possible moves are displayed correctly."""
-    possible_moves = MagicMock()
-    possible_moves.get.side_effect = lambda x, y: (x, y) in [(2, 3), (4, 5)]
+    possible_moves = Bitboard(8)
+    possible_moves.set(4, 5, True)
+    possible_moves.set(2, 3, True)
 
     normal_game.display_possible_moves(possible_moves)
     captured = capsys.readouterr()
 
     assert "Possible moves:" in captured.out
-    assert "c4" in captured.out
-    assert "e6" in captured.out
+    assert "c4 e6\n" in captured.out
+
+
+def test_display_board(normal_game, capsys):
+    normal_game.controller.__str__.return_value = "board"
+    normal_game.display_board()
+    assert capsys.readouterr().out == "board\n\nBLACK's turn (X)\n"
 
 
 def test_check_parser_input(normal_game):
@@ -217,9 +237,13 @@ def test_check_parser_input(normal_game):
     normal_game.running = True
 
     # Test RESTART command
+    mock_controller.post_play_callback = MagicMock()
     with patch("othello.cli.OthelloCLI.play") as mock_play:
         normal_game.check_parser_input("restart", CommandKind.RESTART)
         mock_controller.restart.assert_called_once()
+        mock_controller.post_play_callback.assert_called_once()
+        mock_play.assert_not_called()
+        assert normal_game.running is True
 
     # Test QUIT command
     with patch("builtins.print") as mock_print:
@@ -271,3 +295,22 @@ def test_play(normal_game):
     assert normal_game.display_possible_moves.called
     assert normal_game.controller.next_move.called
     assert normal_game.check_game_over.call_count == 2
+    # the possible moves are looked up again for each iteration
+    for check_call in normal_game.check_game_over.call_args_list:
+        assert check_call.args == ([(3, 4)],)
+
+
+def test_play_invalid_command(normal_game, capsys):
+    """Test that a command the parser rejects is never dispatched."""
+    normal_game.display_history = MagicMock()
+    normal_game.display_board = MagicMock()
+    normal_game.display_possible_moves = MagicMock()
+    normal_game.check_game_over = MagicMock(return_value=True)
+    normal_game.check_parser_input = MagicMock()
+
+    normal_game.play()
+    with patch("builtins.input", return_value="z99"):
+        normal_game.controller.human_play_callback()
+
+    assert "Invalid command" in capsys.readouterr().out
+    normal_game.check_parser_input.assert_not_called()
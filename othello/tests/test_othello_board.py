@@ -1,5 +1,7 @@
 from copy import copy
+import random
 import pytest
+from unittest.mock import patch
 
 from othello.bitboard import Bitboard
 from othello.othello_board import (
@@ -8,6 +10,8 @@ from othello.othello_board import (
     Color,
     OthelloBoard,
     IllegalMoveException,
+    SQUARE_NAMES,
+    ZOBRIST_SIDE,
 )
 
 
@@ -302,6 +306,40 @@ def test_game_over_exception_when_board_full():
     assert board.is_game_over()
 
 
+def test_game_over_full_board_skips_move_generation():
+    size = BoardSize.SIX_BY_SIX
+    board = OthelloBoard(
+        size,
+        black=Bitboard(size.value, (1 << 18) - 1),
+        white=Bitboard(size.value, ((1 << 36) - 1) ^ ((1 << 18) - 1)),
+    )
+    with patch.object(OthelloBoard, "shift_along") as mock_shift_along:
+        assert board.is_game_over()
+        mock_shift_along.assert_not_called()
+
+
+def test_moves_generated_once_per_position():
+    board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    with patch.object(
+        OthelloBoard,
+        "shift_along",
+        autospec=True,
+        side_effect=OthelloBoard.shift_along,
+    ) as mock_shift:
+        board.play(5, 4)
+        # the legality check of black's move, then white's moves for the pass check
+        assert mock_shift.call_count == 2
+        assert not board.is_game_over()
+        moves = board.line_cap_move(Color.WHITE)
+        board.play(*moves.hot_bits_coordinates()[0])
+        # only black's moves for the pass check were new
+        assert mock_shift.call_count == 3
+        board.pop()
+        # the remembered bits are black's, white's are generated again
+        assert board.line_cap_move(Color.WHITE).bits == moves.bits
+        assert mock_shift.call_count == 4
+
+
 def test_illegal_move_occupied_cell():
     board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
     board.play(5, 4)
@@ -309,12 +347,35 @@ def test_illegal_move_occupied_cell():
         board.play(5, 4)
 
 
+def test_illegal_move_off_the_board():
+    board = OthelloBoard(BoardSize.SIX_BY_SIX)
+    # (6, 1) would be the bit of (0, 2) if it was not checked
+    for x_coord, y_coord in ((6, 1), (-1, 3), (2, 6)):
+        with pytest.raises(IllegalMoveException):
+            board.play(x_coord, y_coord)
+
+
+def test_move_to_str():
+    assert OthelloBoard.move_to_str((None, None, 0, 0, Color.BLACK)) == "a1"
+    assert OthelloBoard.move_to_str((None, None, 11, 9, Color.WHITE)) == "l10"
+    assert OthelloBoard.move_to_str((None, None, -1, -1, Color.WHITE)) == "-1-1"
+    assert SQUARE_NAMES[4][2] == "c5"
+
+
 def test_invert():
     p = Color.BLACK
     assert ~p == Color.WHITE
     assert ~~p == Color.BLACK
     p = Color.EMPTY
     assert ~p == Color.EMPTY
+    assert ~Color.POSSIBLE == Color.EMPTY
+
+
+def test_color_index():
+    assert Color.BLACK.index == 0
+    assert Color.WHITE.index == 1
+    assert Color.EMPTY.index is None
+    assert Color.POSSIBLE.index is None
 
 
 def test_pop_empty_board():
@@ -401,3 +462,65 @@ def test_restart():
     assert board != init_state
     board.restart()
     assert board == init_state
+
+
+def test_zobrist_follows_play_and_pop():
+    board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    start_hash = board.zobrist
+    hashes = [start_hash]
+    for move in ((3, 2), (2, 2), (2, 3)):
+        board.play(*move)
+        assert board.zobrist == board.compute_zobrist()
+        hashes.append(board.zobrist)
+    assert len(set(hashes)) == len(hashes)
+    for expected in reversed(hashes[:-1]):
+        board.pop()
+        assert board.zobrist == expected
+    board.play(3, 2)
+    board.restart()
+    assert board.zobrist == start_hash
+
+
+def test_zobrist_transposition():
+    first = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    second = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    for move in ((3, 2), (2, 2), (2, 3), (4, 2)):
+        first.play(*move)
+    for move in ((2, 3), (2, 2), (3, 2), (4, 2)):
+        second.play(*move)
+    assert first == second
+    assert first.zobrist == second.zobrist
+
+
+def test_position_hash_side_to_move():
+    board = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    black_to_move = board.position_hash()
+    board.current_player = Color.WHITE
+    assert board.position_hash() != black_to_move
+    assert board.position_hash() ^ black_to_move == ZOBRIST_SIDE
+
+
+def test_hash_is_position_hash():
+    first = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    second = OthelloBoard(BoardSize.EIGHT_BY_EIGHT)
+    for move in ((3, 2), (2, 2), (2, 3)):
+        first.play(*move)
+    for move in ((2, 3), (2, 2), (3, 2)):
+        second.play(*move)
+    assert first == second
+    assert hash(first) == hash(second) == first.position_hash()
+    assert len({first, second}) == 1
+
+
+@pytest.mark.parametrize("size", list(BoardSize))
+def test_line_cap_move_matches_bitboard_shifts(size):
+    board = OthelloBoard(size)
+    rng = random.Random(size.value)
+    while not board.is_game_over():
+        for color in (Color.BLACK, Color.WHITE):
+            assert board.line_cap_move(color) == board.line_cap_move_(color)
+        moves = board.line_cap_move(board.current_player)
+        if moves.bits:
+            board.play(*moves.random_hot_bit(rng))
+        else:
+            board.current_player = ~board.current_player
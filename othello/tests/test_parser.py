@@ -204,6 +204,7 @@ def test_ai_mode(monkeypatch):
     assert parse_config["ai_depth"] == 3
     assert parse_config["ai_heuristic"] == AIHeuristic.CORNERS_CAPTURED.value
     assert parse_config["ai_time"] == 5
+    assert parse_config["ai_workers"] == 1
 
     # ai color
     monkeypatch.setattr(sys, "argv", ["othello", "-aO"])
@@ -274,6 +275,14 @@ def test_ai_mode(monkeypatch):
     assert parse_config["mode"] == GameMode.AI.value
     assert parse_config["ai_time"] == 25
 
+    # ai workers
+    monkeypatch.setattr(sys, "argv", ["othello", "-a", "--ai-workers", "4"])
+    mode, parse_config = parse_args()
+
+    assert mode == GameMode.AI.value
+    assert parse_config["mode"] == GameMode.AI.value
+    assert parse_config["ai_workers"] == 4
+
 
 # TEST ERRORS
 
@@ -434,3 +443,20 @@ def test_err_AI_time(monkeypatch):
     with pytest.raises(SystemExit):
         monkeypatch.setattr(sys, "argv", ["othello", "-a", "--ai-time", "-1"])
         parse_args()
+
+
+def test_err_AI_workers(monkeypatch):
+    """
+    Test the error handling of the parser for invalid AI workers arguments.
+
+    This test ensures that when a non positive number of AI workers is provided, the
+    parser raises a SystemExit exception with a non-zero exit status.
+    """
+
+    with pytest.raises(SystemExit):
+        monkeypatch.setattr(sys, "argv", ["othello", "-a", "--ai-workers", "0"])
+        parse_args()
+
+    with pytest.raises(SystemExit):
+        monkeypatch.setattr(sys, "argv", ["othello", "-a", "--ai-workers", "-1"])
+        parse_args()